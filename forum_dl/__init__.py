@@ -1,4 +1,5 @@
 import logging
+import re
 import sys
 
 from .forumdl import ForumDl
@@ -27,12 +28,20 @@ def main():
             "The following arguments are required: URL\n"
             "Use 'forum-dl --help' to get a list of all options."
         )
+    elif args.merge:
+        forumdl.merge(args.urls, args.output)
     else:
+        match = re.match(r"^(\d+)/(\d+)$", args.shard)
+
+        if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+            parser.error("--shard must be K/N, with 1 <= K <= N")
+
         warc_output = args.output if args.output_format == "warc" else args.warc_output
         write_outside_file_objects = args.outside_files or bool(warc_output)
 
         forumdl.download(
             urls=args.urls,
+            jobs=int(args.jobs),
             output_format=args.output_format,
             session_options=SessionOptions(
                 timeout=args.timeout,
@@ -42,10 +51,23 @@ def main():
                 warc_output=warc_output,
                 user_agent=args.user_agent,
                 get_urls=args.get_urls,
-                time_sleep=args.time_sleep
+                time_sleep=args.time_sleep,
+                concurrency=args.concurrency,
+                http_cache=args.http_cache,
+                memory_cache_size=args.memory_cache_size,
+                visited_error_rate=args.visited_error_rate,
+                visited_capacity=args.visited_capacity,
+                pool_size=args.pool_size,
             ),
             extractor_options=ExtractorOptions(
                 path=False,
+                shard_index=int(match.group(1)) - 1,
+                shard_count=int(match.group(2)),
+                batch_size=args.batch_size,
+                latest=args.latest,
+                bulk=args.bulk,
+                detection_cache=args.detection_cache,
+                parser=args.parser,
             ),
             writer_options=WriterOptions(
                 output_path=args.output,
@@ -58,5 +80,9 @@ def main():
                 textify=args.textify,
                 content_as_title=args.content_as_title,
                 author_as_addr_spec=args.author_as_addr_spec,
+                incremental=args.incremental,
+                resume=args.resume,
+                checkpoint_interval=args.checkpoint_interval,
+                write_queue_size=args.write_queue_size,
             ),
         )
@@ -0,0 +1,223 @@
+# pyright: strict
+from __future__ import annotations
+from typing import *  # type: ignore
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+if TYPE_CHECKING:
+    from requests import Response
+
+
+K = TypeVar("K", bound=Hashable)
+
+
+class ResponseCache(Generic[K]):
+    # Rough memory taken by a `Response` besides its body and headers: the prepared request, the
+    # raw response, the connection objects and so on. It dwarfs the body of small JSON responses.
+    RESPONSE_OVERHEAD = 8 * 1024
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[K, tuple[Response, int]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __str__(self):
+        return (
+            f"{len(self)} responses, {self.size} bytes, {self.hits} hits,"
+            f" {self.misses} misses, {self.evictions} evictions"
+        )
+
+    @classmethod
+    def estimate_size(cls, response: Response):
+        headers_size = sum(len(k) + len(v) for k, v in response.headers.items())
+        return cls.RESPONSE_OVERHEAD + headers_size + len(response.content)
+
+    def get(self, key: K, *, should_count_miss: bool = True):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                if should_count_miss:
+                    self.misses += 1
+
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: K, response: Response):
+        response_size = self.estimate_size(response)
+
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+
+            if response_size > self.max_size:
+                self.evictions += 1
+                return
+
+            self._entries[key] = (response, response_size)
+            self.size += response_size
+
+            while self.size > self.max_size:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def pop(self, key: K):
+        with self._lock:
+            if (entry := self._entries.pop(key, None)) is not None:
+                self.size -= entry[1]
+                return entry[0]
+
+
+class DiskCacheEntry(NamedTuple):
+    url: str
+    headers: dict[str, str]
+    content: bytes
+
+    @property
+    def validators(self):
+        validators: dict[str, str] = {}
+
+        if etag := self.headers.get("ETag"):
+            validators["If-None-Match"] = etag
+
+        if last_modified := self.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = last_modified
+
+        return validators
+
+    def build_response(self, revalidation_response: Response):
+        # Imported here, as `requests` must not be imported before WARC recording is set up.
+        from requests.models import Response
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers
+
+        response = Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = revalidation_response.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.history = revalidation_response.history
+        response.request = revalidation_response.request
+        response.elapsed = revalidation_response.elapsed
+        response._content = self.content  # type: ignore
+
+        return response
+
+
+class DiskCache:
+    def __init__(self, path: str):
+        os.makedirs(path, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(path, "cache.sqlite"), check_same_thread=False
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses"
+            " (key TEXT PRIMARY KEY, url TEXT, headers TEXT, content BLOB)"
+        )
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _key(url: str, params: dict[str, Any], headers: dict[str, Any]):
+        serialized = json.dumps(
+            [url, sorted(params.items()), sorted(headers.items())], default=str
+        )
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def load(self, url: str, params: dict[str, Any], headers: dict[str, Any]):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, headers, content FROM responses WHERE key = ?",
+                (self._key(url, params, headers),),
+            ).fetchone()
+
+        if row:
+            return DiskCacheEntry(
+                url=row[0], headers=json.loads(row[1]), content=row[2]
+            )
+
+    def store(
+        self,
+        url: str,
+        params: dict[str, Any],
+        headers: dict[str, Any],
+        response: Response,
+    ):
+        # Responses without validators could never be revalidated, so there is no point keeping them.
+        if not ("ETag" in response.headers or "Last-Modified" in response.headers):
+            return
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (
+                    self._key(url, params, headers),
+                    response.url,
+                    json.dumps(dict(response.headers)),
+                    response.content,
+                ),
+            )
+            self._db.commit()
+
+
+class DetectionEntry(NamedTuple):
+    extractor: str
+    base_url: str
+
+
+class DetectionStore:
+    def __init__(self, path: str):
+        self._path = path
+        self._lock = threading.Lock()
+
+        try:
+            with open(path, "r") as f:
+                self._entries: dict[str, str] = json.load(f)
+        except FileNotFoundError:
+            self._entries = {}
+
+    def load(self, url: str):
+        # The deepest base URL the URL lies under, so that sites sharing a host (e.g. several
+        # archives of one server) are told apart.
+        with self._lock:
+            base_urls = [
+                base_url for base_url in self._entries if f"{url}/".startswith(base_url)
+            ]
+
+            if base_urls:
+                base_url = max(base_urls, key=len)
+                return DetectionEntry(self._entries[base_url], base_url)
+
+    def store(self, entry: DetectionEntry):
+        with self._lock:
+            self._entries[entry.base_url] = entry.extractor
+
+            # Written to a temporary file first, so that an interrupted run can't corrupt the store.
+            with open(f"{self._path}.tmp", "w") as f:
+                json.dump(self._entries, f, indent=2, sort_keys=True)
+
+            os.replace(f"{self._path}.tmp", self._path)
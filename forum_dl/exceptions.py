@@ -15,6 +15,10 @@ class WriterNotFoundError(ForumDlException):
     pass
 
 
+class ResumeNotSupportedError(ForumDlException):
+    pass
+
+
 class AlreadyVisitedError(ForumDlException):
     pass
 
@@ -4,10 +4,12 @@ from typing import *  # type: ignore
 from types import ModuleType
 
 import inspect
+import threading
 
-from .common import Extractor, ExtractorOptions
+from .common import Extractor, ExtractorOptions, DetectionCache
+from ..cache import DetectionEntry, DetectionStore
 from ..exceptions import ExtractorNotFoundError
-from ..session import Session, SessionOptions
+from ..session import Session
 
 modules = [
     "hackernews",
@@ -24,14 +26,31 @@ modules = [
 ]
 
 
-def find(
-    url: str, session_options: SessionOptions, extractor_options: ExtractorOptions
-):
-    session = Session(session_options)
+_detection_stores: dict[str, DetectionStore] = {}
+_detection_stores_lock = threading.Lock()
 
-    for cls in list_classes():
-        obj = cls.detect(session, url, extractor_options)
+
+def find(url: str, session: Session, extractor_options: ExtractorOptions):
+    classes = list(list_classes())
+    store = None
+
+    if extractor_options.detection_cache:
+        store = _get_detection_store(extractor_options.detection_cache)
+
+        if entry := store.load(url):
+            for cls in classes:
+                if _get_class_name(cls) == entry.extractor:
+                    return cls(session, entry.base_url, extractor_options)
+
+    cache = DetectionCache(session)
+
+    # Extractors whose URL patterns match are tried first, as they are the likeliest ones.
+    for cls in sorted(classes, key=lambda cls: not cls.matches_url(url)):
+        obj = cls.detect(session, url, extractor_options, cache)
         if obj:
+            if store and not obj.is_detected_from_url:
+                store.store(DetectionEntry(_get_class_name(type(obj)), obj.base_url))
+
             return obj
 
     raise ExtractorNotFoundError(url)
@@ -55,3 +74,15 @@ def _get_classes(module: ModuleType):
             and issubclass(cls, Extractor)
         )
     ]
+
+
+def _get_class_name(cls: type[Extractor]):
+    return f"{cls.__module__.rsplit('.', 1)[-1]}.{cls.__name__}"
+
+
+def _get_detection_store(path: str):
+    with _detection_stores_lock:
+        if path not in _detection_stores:
+            _detection_stores[path] = DetectionStore(path)
+
+        return _detection_stores[path]
@@ -3,15 +3,16 @@ from __future__ import annotations
 from typing import *  # type: ignore
 
 from abc import ABC, abstractmethod
-from pydantic import BaseModel
+from pydantic import BaseModel, Extra
 from urllib.parse import urljoin, urlparse, urlunparse, parse_qs, urlencode
 from pathlib import PurePosixPath
 from datetime import datetime
 import logging
+import re
 import traceback
 
 from ..session import Session
-from ..soup import Soup, SoupTag
+from ..soup import Soup, SoupTag, SoupStrainer, LxmlSoup
 from ..exceptions import AttributeSearchError, SearchError
 from ..version import __version__
 
@@ -90,12 +91,29 @@ def regex_search(pattern: Pattern[str], strings: list[str] | str):
 
 class ExtractorOptions(BaseModel):
     path: bool
+    shard_index: int = 0
+    shard_count: int = 1
+    batch_size: int = 20
+    latest: bool = False
+    bulk: bool = False
+    detection_cache: str = ""
+    parser: str = "bs4"
 
 
 class PageState(BaseModel):
     url: str
     page: int
 
+    class Config:
+        # Keeps the fields of subclasses when states are read back from writer metadata.
+        extra = Extra.allow
+
+
+class PageListState(PageState):
+    # Pages whose URLs are all known upfront.
+    urls: list[str]
+    offset: int = 0
+
 
 class Item(BaseModel):
     path: tuple[str, ...]
@@ -126,23 +144,60 @@ class File(Item):
     os_path: str | None = None
 
 
+class DetectionCache:
+    # Pages fetched during detection, shared by the detectors of all extractors so that each page
+    # is requested and parsed only once.
+    def __init__(self, session: Session):
+        self._session = session
+        self._soups: dict[str, Soup] = {}
+
+    def get(self, url: str):
+        # An empty path is requested as "/" anyway, so both spellings make one request.
+        if not urlparse(url).path:
+            url = str(urlunparse(urlparse(url)._replace(path="/")))
+
+        return self._session.try_get(url, should_cache=True, should_retry=False)
+
+    def parse(self, response: Response):
+        if response.url not in self._soups:
+            self._soups[response.url] = Soup(response.content)
+
+        return self._soups[response.url]
+
+
 class Extractor(ABC):
     tests: list[dict[str, Any]]
 
+    # URLs matching this are tried with this extractor before any other.
+    _url_regex: Pattern[str] | None = None
+
+    # Detection only looks at the URL, so it isn't worth remembering. Detection results are
+    # remembered by base URL, which may also be shared by several extractors of such sites.
+    is_detected_from_url = False
+
+    @final
+    @classmethod
+    def matches_url(cls, url: str):
+        return cls._url_regex is not None and bool(cls._url_regex.search(url))
+
     @final
     @classmethod
     def detect(
-        cls, session: Session, url: str, options: ExtractorOptions
+        cls,
+        session: Session,
+        url: str,
+        options: ExtractorOptions,
+        cache: DetectionCache | None = None,
     ) -> Extractor | None:
         try:
-            return cls._detect(session, url, options)
+            return cls._detect(session, url, options, cache or DetectionCache(session))
         except SearchError:
             pass
 
     @staticmethod
     @abstractmethod
     def _detect(
-        session: Session, url: str, options: ExtractorOptions
+        session: Session, url: str, options: ExtractorOptions, cache: DetectionCache
     ) -> Extractor | None:
         pass
 
@@ -161,6 +216,10 @@ class Extractor(ABC):
         self.board_state: PageState | None = None
         self.thread_state: PageState | None = None
 
+    @property
+    def session(self):
+        return self._session
+
     @final
     def fetch(self):
         self._fetch_top_boards()
@@ -365,6 +424,18 @@ class Extractor(ABC):
             logging.warning(repr(e))
             logging.warning(traceback.format_exc())
 
+    def get_thread_marker(self, thread: Thread) -> str | None:
+        # A value that changes whenever the thread gets new posts, if the extractor can tell
+        # without fetching the thread. Used to skip unchanged threads in incremental mode.
+        return None
+
+    def get_thread_update_state(
+        self, thread: Thread, archived_subpaths: set[tuple[str, ...]]
+    ) -> PageState | None:
+        # An initial state from which only the posts not archived yet are fetched, if the extractor
+        # supports it. Used to update changed threads in incremental mode.
+        return None
+
     @final
     def threads(self, board: Board, initial_state: PageState | None = None):
         for item in self._fetch_board_threads(board, initial_state):
@@ -404,22 +475,63 @@ class Extractor(ABC):
 class HtmlExtractor(Extractor):
     _board_item_css: str
     _board_next_page_css: str
+    _board_page_css: str | None = None
     _thread_item_css: str
     _thread_next_page_css: str
+    _thread_page_css: str | None = None
+
+    _page_url_number_regex = re.compile(r"(\d+)")
+
+    def _parse(self, markup: str | bytes, only: SoupStrainer | None = None) -> Soup:
+        if self._options.parser == "lxml":
+            return LxmlSoup(markup, only)
+
+        return Soup(markup, only)
 
     @final
     def _fetch_board_page_threads(self, board: Board, state: PageState):
+        if isinstance(state, PageListState):
+            return (yield from self._fetch_board_page_list_threads(board, state))
+
         response = self._session.get(state.url)
-        soup = Soup(response.content)
+        soup = self._parse(response.content)
+
+        yield from self._extract_board_page_items(board, state, response, soup)
+
+        if state.page == 1 and (
+            urls := self._extract_board_page_urls(board, state, response, soup)
+        ):
+            return PageListState(url=urls[0], page=state.page + 1, urls=urls)
+
+        return self._extract_board_next_page_state(board, state, response, soup)
 
-        for tag in soup.soup.select(self._board_item_css):
-            if thread := self._extract_board_page_thread(
-                board, state, response, SoupTag(tag)
-            ):
+    def _fetch_board_page_list_threads(self, board: Board, state: PageListState):
+        first_offset = state.offset
+        first_page = state.page
+        response = None
+        soup = None
+
+        # The state follows the page being read, so that checkpoints point at it.
+        for i, response in enumerate(self._session.get_many(state.urls[first_offset:])):
+            state.offset = first_offset + i
+            state.page = first_page + i
+            state.url = state.urls[state.offset]
+            soup = self._parse(response.content)
+
+            yield from self._extract_board_page_items(board, state, response, soup)
+
+        # Pages may have been added since the first one was read.
+        if response is not None and soup is not None:
+            return self._extract_board_next_page_state(board, state, response, soup)
+
+    def _extract_board_page_items(
+        self, board: Board, state: PageState, response: Response, soup: Soup
+    ):
+        for tag in soup.select(self._board_item_css):
+            if thread := self._extract_board_page_thread(board, state, response, tag):
                 yield thread
 
         yield from self._extract_file_objects((), (), soup, response)
-        return self._extract_board_next_page_state(board, state, response, soup)
 
     @abstractmethod
     def _extract_board_page_thread(
@@ -430,27 +542,69 @@ class HtmlExtractor(Extractor):
     def _extract_board_next_page_state(
         self, board: Board, state: PageState, response: Response, soup: Soup
     ):
-        if next_page_tag := soup.soup.select_one(self._board_next_page_css):
-            href = cast(str, next_page_tag.get("href"))
+        if next_page_tag := soup.select_one(self._board_next_page_css):
+            href = cast(str, next_page_tag.try_get("href"))
 
             return PageState(url=urljoin(response.url, href), page=state.page + 1)
 
+    def _extract_board_page_urls(
+        self, board: Board, state: PageState, response: Response, soup: Soup
+    ) -> list[str] | None:
+        # URLs of all pages after the first one, so that they can be fetched concurrently. None
+        # makes the extractor walk the next page links instead.
+        if next_state := self._extract_board_next_page_state(
+            board, state, response, soup
+        ):
+            return self._extract_page_urls(
+                next_state.url, response, soup, self._board_page_css
+            )
+
     @final
     def _fetch_thread_page_posts(self, thread: Thread, state: PageState):
+        if isinstance(state, PageListState):
+            return (yield from self._fetch_thread_page_list_posts(thread, state))
+
         response = self._session.get(state.url)
-        soup = Soup(response.content)
+        soup = self._parse(response.content)
+
+        yield from self._extract_thread_page_items(thread, state, response, soup)
+
+        if state.page == 1 and (
+            urls := self._extract_thread_page_urls(thread, state, response, soup)
+        ):
+            return PageListState(url=urls[0], page=state.page + 1, urls=urls)
+
+        return self._extract_thread_next_page_state(thread, state, response, soup)
+
+    def _fetch_thread_page_list_posts(self, thread: Thread, state: PageListState):
+        first_offset = state.offset
+        first_page = state.page
+        response = None
+        soup = None
+
+        for i, response in enumerate(self._session.get_many(state.urls[first_offset:])):
+            state.offset = first_offset + i
+            state.page = first_page + i
+            state.url = state.urls[state.offset]
+            soup = self._parse(response.content)
 
+            yield from self._extract_thread_page_items(thread, state, response, soup)
+
+        if response is not None and soup is not None:
+            return self._extract_thread_next_page_state(thread, state, response, soup)
+
+    def _extract_thread_page_items(
+        self, thread: Thread, state: PageState, response: Response, soup: Soup
+    ):
         content_file_urls: list[str] = []
 
-        for tag in soup.soup.select(self._thread_item_css):
-            if post := self._extract_thread_page_post(
-                thread, state, response, SoupTag(tag)
-            ):
+        for tag in soup.select(self._thread_item_css):
+            if result := self._extract_thread_page_post(thread, state, response, tag):
+                post, content_tag = result
                 yield post
 
-                # TODO: Don't reparse text.
                 new_content_file_urls = yield from self._extract_file_objects(
-                    post.path, post.subpath, Soup(post.content), response
+                    post.path, post.subpath, content_tag, response
                 )
                 content_file_urls.extend(new_content_file_urls)
 
@@ -458,25 +612,91 @@ class HtmlExtractor(Extractor):
             if file.url not in content_file_urls:
                 yield file
 
-        return self._extract_thread_next_page_state(thread, state, response, soup)
-
     @abstractmethod
     def _extract_thread_page_post(
         self, thread: Thread, state: PageState, response: Response, tag: SoupTag
-    ) -> Post | None:
+    ) -> tuple[Post, SoupTag] | None:
+        # Returns the post together with the tag holding its content, in which embedded files are
+        # looked for.
         pass
 
     def _extract_thread_next_page_state(
         self, thread: Thread, state: PageState, response: Response, soup: Soup
     ):
-        if next_page_tag := soup.soup.select_one(self._thread_next_page_css):
-            href = cast(str, next_page_tag.get("href"))
+        if next_page_tag := soup.select_one(self._thread_next_page_css):
+            href = cast(str, next_page_tag.try_get("href"))
 
             if not href:
                 return
 
             return PageState(url=urljoin(response.url, href), page=state.page + 1)
 
+    def _extract_thread_page_urls(
+        self, thread: Thread, state: PageState, response: Response, soup: Soup
+    ) -> list[str] | None:
+        if next_state := self._extract_thread_next_page_state(
+            thread, state, response, soup
+        ):
+            return self._extract_page_urls(
+                next_state.url, response, soup, self._thread_page_css
+            )
+
+    def _extract_page_urls(
+        self, second_url: str, response: Response, soup: Soup, page_css: str | None
+    ):
+        # Interpolates the URLs between the second and the last page, found among the numbered
+        # page links. Only works if the two URLs differ by a single number growing at a constant
+        # step (page number, item offset, ...).
+        if not page_css:
+            return None
+
+        last_page = 0
+        last_url = ""
+
+        for tag in soup.select(page_css):
+            text = tag.text.strip()
+            number = text if text.isdigit() else str(tag.try_get("data-page", ""))
+
+            if number.isdigit() and int(number) > last_page and tag.try_get("href"):
+                last_page = int(number)
+                last_url = urljoin(response.url, tag.get("href"))
+
+        if last_page < 2:
+            return None
+
+        if last_page == 2:
+            return [second_url]
+
+        second_parts = self._page_url_number_regex.split(second_url)
+        last_parts = self._page_url_number_regex.split(last_url)
+
+        if len(second_parts) != len(last_parts):
+            return None
+
+        changed_indexes = [
+            i for i, (a, b) in enumerate(zip(second_parts, last_parts)) if a != b
+        ]
+
+        # Odd indexes are the numbers.
+        if len(changed_indexes) != 1 or changed_indexes[0] % 2 != 1:
+            return None
+
+        i = changed_indexes[0]
+        first_number = int(second_parts[i])
+        step, remainder = divmod(int(last_parts[i]) - first_number, last_page - 2)
+
+        if remainder or step <= 0:
+            return None
+
+        return [
+            "".join(
+                second_parts[:i]
+                + [str(first_number + k * step)]
+                + second_parts[i + 1 :]
+            )
+            for k in range(last_page - 1)
+        ]
+
     @final
     def _extract_file_objects(
         self,
@@ -485,23 +705,16 @@ class HtmlExtractor(Extractor):
         soup_or_tag: Soup | SoupTag,
         response: Response,
     ):
-        match soup_or_tag:
-            case Soup():
-                obj = soup_or_tag.soup
-            case SoupTag():
-                obj = soup_or_tag.tag
-
-        embeds = obj.select(
+        embeds = soup_or_tag.select(
             'link[rel="stylesheet"], embed, audio, img, object, svg, video'
         )
 
         urls: list[str] = []
 
         for embed in embeds:
-            embed = SoupTag(embed)
             url = None
 
-            if embed.tag.name == "link":
+            if embed.name == "link":
                 url = urljoin(response.url, embed.get("href"))
                 yield File(
                     path=path,
@@ -510,7 +723,7 @@ class HtmlExtractor(Extractor):
                     data={},
                     subpath=subpath + (url,),
                 )
-            elif embed.tag.name == "embed":
+            elif embed.name == "embed":
                 url = urljoin(response.url, embed.get("src"))
 
                 yield File(
@@ -520,8 +733,8 @@ class HtmlExtractor(Extractor):
                     data={},
                     subpath=subpath + (url,),
                 )
-            elif embed.tag.name == "audio":
-                for source in embed.tag.find_all("source"):
+            elif embed.name == "audio":
+                for source in embed.find_all("source"):
                     url = urljoin(response.url, source.get("src"))
                     yield File(
                         path=path,
@@ -530,7 +743,7 @@ class HtmlExtractor(Extractor):
                         data={},
                         subpath=subpath + (url,),
                     )
-            elif embed.tag.name == "img":
+            elif embed.name == "img":
                 try:
                     url = urljoin(response.url, embed.get("src"))
                 except AttributeSearchError:
@@ -543,7 +756,7 @@ class HtmlExtractor(Extractor):
                     data={},
                     subpath=subpath + (url,),
                 )
-            elif embed.tag.name == "object":
+            elif embed.name == "object":
                 url = urljoin(response.url, embed.get("data"))
                 yield File(
                     path=path,
@@ -552,7 +765,7 @@ class HtmlExtractor(Extractor):
                     data={},
                     subpath=subpath + (url,),
                 )
-            elif embed.tag.name == "svg":
+            elif embed.name == "svg":
                 yield File(
                     path=path,
                     url=response.url,
@@ -4,15 +4,21 @@ from typing import *  # type: ignore
 
 from pathlib import PurePosixPath
 from urllib.parse import urljoin, urlparse, urlunparse
+import re
 
 from .common import get_relative_url, normalize_url
 from .common import Extractor, ExtractorOptions, Board, Thread, Post, PageState
+from .common import DetectionCache
 from ..session import Session
-from ..soup import Soup
 
 
 class DiscourseThreadPageState(PageState):
     stream_data: list[int]
+    offset: int = 0
+
+
+class DiscourseThreadUpdateState(PageState):
+    archived_post_ids: set[int]
 
 
 class DiscourseExtractor(Extractor):
@@ -55,15 +61,17 @@ class DiscourseExtractor(Extractor):
         },
     ]
 
+    _url_regex = re.compile(r"/t/[^/]+/\d+|/c/[^/]+/\d+")
+
     @staticmethod
-    def _detect(session: Session, url: str, options: ExtractorOptions):
+    def _detect(
+        session: Session, url: str, options: ExtractorOptions, cache: DetectionCache
+    ):
         url = url.removesuffix("/").removesuffix(".json")
         url = url.removesuffix(".json")
 
-        response = session.try_get(
-            normalize_url(url), should_cache=True, should_retry=False
-        )
-        soup = Soup(response.content)
+        response = cache.get(normalize_url(url))
+        soup = cache.parse(response)
 
         crawler_nav = soup.find("nav", class_="crawler-nav")
         home_anchor = crawler_nav.find("a")
@@ -71,6 +79,11 @@ class DiscourseExtractor(Extractor):
 
         return DiscourseExtractor(session, normalize_url(base_url), options)
 
+    def __init__(self, session: Session, base_url: str, options: ExtractorOptions):
+        super().__init__(session, base_url, options)
+        self._category_paths: dict[str, tuple[str, ...]] = {}
+        self._has_listed_latest = False
+
     def _fetch_top_boards(self):
         self._are_subboards_fetched[self.root.path] = True
         response = self._session.get(urljoin(self.base_url, "site.json"))
@@ -79,6 +92,7 @@ class DiscourseExtractor(Extractor):
         for category_data in site_json["categories"]:
             if "parent_category_id" not in category_data:
                 category_id = str(category_data["id"])
+                self._category_paths[category_id] = (category_id,)
 
                 self._set_board(
                     path=(category_id,),
@@ -96,6 +110,7 @@ class DiscourseExtractor(Extractor):
                 slug = category_data["slug"]
                 category_id = str(category_data["id"])
                 parent_id = str(category_data["parent_category_id"])
+                self._category_paths[category_id] = (parent_id, category_id)
 
                 self._set_board(
                     path=(parent_id, category_id),
@@ -134,21 +149,13 @@ class DiscourseExtractor(Extractor):
             response = self._session.get(json_url, should_cache=True)
             data = response.json()
 
-            slug = data["slug"]
             category_id = str(data["category_id"])
 
-            if category_id in self._subboards[self.root.path]:
-                path = (category_id, f"{topic_id}")
-            else:
-                for _, subboard in self._subboards[self.root.path].items():
-                    if category_id in self._subboards[self.root.path]:
-                        path = subboard.path + (category_id, f"{topic_id}")
-                        break
-                else:
-                    raise ValueError
+            if category_id not in self._category_paths:
+                raise ValueError
 
             return Thread(
-                path=path,
+                path=self._category_paths[category_id] + (topic_id,),
                 url=url,
                 origin=response.url,
                 data=data,
@@ -164,7 +171,18 @@ class DiscourseExtractor(Extractor):
         yield from ()
 
     def _fetch_board_page_threads(self, board: Board, state: PageState):
-        if state.url == board.url:
+        if state.url == board.url and board.path == ():
+            if not self._options.latest:
+                return None
+
+            # Threads of all categories, most recently bumped first.
+            self._has_listed_latest = True
+            state.url = urljoin(self.base_url, "latest.json")
+        elif state.url == board.url:
+            # Categories have already been covered by the list of latest threads.
+            if self._has_listed_latest:
+                return None
+
             relative_url = get_relative_url(state.url, self.base_url)
             url_parts = PurePosixPath(relative_url).parts
 
@@ -178,8 +196,12 @@ class DiscourseExtractor(Extractor):
 
         for data in page_json["topic_list"]["topics"]:
             topic_id = str(data["id"])
+            category_path = board.path or self._category_paths.get(
+                str(data["category_id"]), (str(data["category_id"]),)
+            )
+
             yield Thread(
-                path=board.path + (topic_id,),
+                path=category_path + (topic_id,),
                 url=urljoin(self.base_url, f"t/{data['slug']}/{topic_id}"),
                 origin=response.url,
                 data=data,
@@ -197,48 +219,90 @@ class DiscourseExtractor(Extractor):
                 page=state.page + 1,
             )
 
+    def get_thread_marker(self, thread: Thread):
+        data = thread.data
+
+        if "highest_post_number" in data:
+            return f"{data.get('posts_count')}/{data['highest_post_number']}"
+
+    def get_thread_update_state(
+        self, thread: Thread, archived_subpaths: set[tuple[str, ...]]
+    ):
+        return DiscourseThreadUpdateState(
+            url=thread.url,
+            page=1,
+            archived_post_ids={int(subpath[0]) for subpath in archived_subpaths},
+        )
+
     def _fetch_thread_page_posts(self, thread: Thread, state: PageState):
         if state.url == thread.url:
+            archived_post_ids: set[int] = set()
+
+            if isinstance(state, DiscourseThreadUpdateState):
+                archived_post_ids = state.archived_post_ids
+
             json_url = f"{state.url}.json"
             response = self._session.get(json_url)
             page_json = response.json()
-            state = DiscourseThreadPageState(
-                url=response.url,
-                stream_data=page_json["post_stream"]["stream"],
-                page=state.page + 1,
-            )
-        else:
-            origin = state.url
-            state = cast(DiscourseThreadPageState, state)
-            post_ids = tuple(state.stream_data[:20])
-            response = self._session.get(
-                origin,
-                params={"post_ids[]": post_ids},
-                should_cache=False,
+
+            datas = page_json["post_stream"]["posts"]
+            yield from self._make_posts(
+                thread,
+                response.url,
+                [data for data in datas if data["id"] not in archived_post_ids],
             )
-            page_json = response.json()
 
-        datas = page_json["post_stream"]["posts"]
+            topic_id = str(page_json["id"])
+            stream_data = [
+                post_id
+                for post_id in page_json["post_stream"]["stream"][len(datas) :]
+                if post_id not in archived_post_ids
+            ]
+
+            if stream_data:
+                return DiscourseThreadPageState(
+                    url=urljoin(self.base_url, f"t/{topic_id}/posts.json"),
+                    page=state.page + 1,
+                    stream_data=stream_data,
+                )
+
+            return None
+
+        # All remaining posts are requested in batches, concurrently. The state is updated as the
+        # batches come in, so that it always points at the batch of the latest post.
+        state = cast(DiscourseThreadPageState, state)
+        batch_size = self._options.batch_size
+        offsets = range(state.offset, len(state.stream_data), batch_size)
 
+        responses = self._session.map(
+            lambda offset: self._session.get(
+                state.url,
+                params={
+                    "post_ids[]": tuple(state.stream_data[offset : offset + batch_size])
+                },
+            ),
+            offsets,
+        )
+
+        for offset, response in zip(offsets, responses):
+            state.offset = offset
+            yield from self._make_posts(
+                thread, response.url, response.json()["post_stream"]["posts"]
+            )
+
+    def _make_posts(self, thread: Thread, origin: str, datas: list[dict[str, Any]]):
         for data in datas:
             topic_slug = data["topic_slug"]
             topic_id = data["topic_id"]
             post_number = data["post_number"]
 
-            state.stream_data.pop(0)
             yield Post(
                 path=thread.path,
                 subpath=(str(data["id"]),),
                 url=urljoin(self.base_url, f"t/{topic_slug}/{topic_id}/{post_number}"),
-                origin=response.url,
+                origin=origin,
                 data=data,
                 author=data.get("username", None),
                 creation_time=data.get("created_at", None),
                 content=data.get("cooked", None),
             )
-
-        topic_id = str(page_json["id"])
-
-        if state.stream_data:
-            state.url = urljoin(self.base_url, f"t/{topic_id}/posts.json")
-            return state
@@ -3,12 +3,16 @@ from __future__ import annotations
 from typing import *  # type: ignore
 
 from abc import abstractmethod
+from collections import OrderedDict
 from urllib.parse import urljoin, urlparse, parse_qs
 import logging
+import re
 from datetime import datetime
 
 from .common import Extractor, ExtractorOptions, Board, Thread, Post, PageState
+from .common import DetectionCache
 from ..session import Session
+from ..visited import Bitmap
 
 
 class HackernewsExtractor(Extractor):
@@ -79,10 +83,16 @@ class HackernewsExtractor(Extractor):
         },
     ]
 
+    _url_regex = re.compile(r"^https?://news\.ycombinator\.com(/|$)")
+    is_detected_from_url = True
+
     PAGE_SIZE = 1000
+    ITEM_CACHE_SIZE = 100_000
 
     @staticmethod
-    def _detect(session: Session, url: str, options: ExtractorOptions):
+    def _detect(
+        session: Session, url: str, options: ExtractorOptions, cache: DetectionCache
+    ):
         parsed_url = urlparse(url)
         if parsed_url.netloc == "news.ycombinator.com":
             if parsed_url.path == "/newest":
@@ -105,6 +115,48 @@ class HackernewsExtractor(Extractor):
 
             return HackernewsExtractor(session, urljoin(url, "/"), options)
 
+    def __init__(self, session: Session, base_url: str, options: ExtractorOptions):
+        super().__init__(session, base_url, options)
+
+        self._items: OrderedDict[int, dict[str, Any] | None] = OrderedDict()
+
+    @staticmethod
+    def _get_item_firebase_url(item_id: int):
+        return f"https://hacker-news.firebaseio.com/v0/item/{item_id}.json"
+
+    def _fetch_items(self, item_ids: Iterable[int]):
+        item_ids = list(item_ids)
+        items: dict[int, dict[str, Any] | None] = {}
+
+        # Hits are touched before anything is inserted, so that they can't be evicted by the
+        # items fetched along with them.
+        for item_id in item_ids:
+            if item_id in self._items:
+                self._items.move_to_end(item_id)
+                items[item_id] = self._items[item_id]
+
+        missing_ids = list(
+            dict.fromkeys(item_id for item_id in item_ids if item_id not in items)
+        )
+
+        # Not marked as visited, so that items evicted from here can be fetched again. Neither are
+        # they kept in the response cache, as this is the only cache of items.
+        responses = self._session.get_many(
+            (self._get_item_firebase_url(item_id) for item_id in missing_ids),
+            should_mark_visited=False,
+        )
+
+        for item_id, response in zip(missing_ids, responses):
+            items[item_id] = self._items[item_id] = response.json()
+
+        while len(self._items) > self.ITEM_CACHE_SIZE:
+            self._items.popitem(last=False)
+
+        return [items[item_id] for item_id in item_ids]
+
+    def _fetch_item(self, item_id: int):
+        return self._fetch_items([item_id])[0]
+
     def _calc_first_item_id(self, page_id: int):
         return 1 + (page_id * self.PAGE_SIZE)
 
@@ -114,7 +166,7 @@ class HackernewsExtractor(Extractor):
     def _fetch_top_boards(self):
         firebase_url = f"https://hacker-news.firebaseio.com/v0/maxitem.json"
         self._max_item_id = int(self._session.get(firebase_url).content)
-        self.pages: list[list[int]] = [[]] * (1 + self._calc_page_id(self._max_item_id))
+        self._seen_items = Bitmap(self._max_item_id + 1)
 
     def _do_fetch_subboards(self, board: Board):
         pass
@@ -142,52 +194,49 @@ class HackernewsExtractor(Extractor):
         yield from ()
 
     def _get_is_fetchable(self, item_id: int):
-        if item_id > self._max_item_id:
-            return False
-
-        page_id = self._calc_page_id(item_id)
-
-        if item_id in self.pages[page_id]:
-            return False
-
-        return True
+        return item_id <= self._max_item_id and item_id not in self._seen_items
 
     def _register_item(self, item_id: int):
-        page_id = self._calc_page_id(item_id)
-
-        if page_id >= len(self.pages):
+        # Items newer than `maxitem` at the start of the crawl are out of its scope.
+        if item_id > self._max_item_id:
             return False
 
-        self.pages[page_id].append(item_id)
+        self._seen_items.add(item_id)
         return True
 
     def _fetch_item_thread(self, item_id: int):
         while True:
-            firebase_url = f"https://hacker-news.firebaseio.com/v0/item/{item_id}.json"
-            response = self._session.get(firebase_url, should_cache=True)
-            data = response.json()
+            data = self._fetch_item(item_id)
+
+            if not data:
+                return None
 
             if "parent" in data:
                 item_id = data["parent"]
             else:
-                page_id = self._calc_page_id(item_id)
-                self.pages[page_id].append(item_id)
-
-                self._register_item(item_id)
-                return Thread(
-                    path=(
-                        str(
-                            item_id,
-                        ),
-                    ),
-                    url=f"https://news.ycombinator.com/item?id={item_id}",
-                    origin=response.url,
-                    data=data,
-                    title=data.get("title", None),
-                )
+                return self._make_root_thread(item_id, data)
+
+    def _make_root_thread(self, item_id: int, data: dict[str, Any]):
+        self._register_item(item_id)
+        return Thread(
+            path=(
+                str(
+                    item_id,
+                ),
+            ),
+            url=f"https://news.ycombinator.com/item?id={item_id}",
+            origin=self._get_item_firebase_url(item_id),
+            data=data,
+            title=data.get("title", None),
+        )
+
+    def _get_shard_page_id(self, page_id: int):
+        # Pages are dealt round-robin to shards. Returns the highest page of this shard not above
+        # `page_id`.
+        shard_count = self._options.shard_count
+        return page_id - (page_id - self._options.shard_index) % shard_count
 
     def _fetch_board_page_threads(self, board: Board, state: PageState):
-        # FIXME: This is ineffective, as we connect twice for each non-top item.
         # We make artificial pages of 1000 items.
 
         parsed_state_url = urlparse(state.url)
@@ -199,50 +248,78 @@ class HackernewsExtractor(Extractor):
         else:
             page_id = self._calc_page_id(self._max_item_id)
 
-        # Remove pages above the state item id.
-        del self.pages[page_id + 1 :]
+        page_id = self._get_shard_page_id(page_id)
 
-        for item_id in reversed(
-            range(
-                self._calc_first_item_id(page_id), self._calc_first_item_id(page_id + 1)
+        if page_id < 0:
+            return None
+
+        item_ids = [
+            item_id
+            for item_id in reversed(
+                range(
+                    self._calc_first_item_id(page_id),
+                    self._calc_first_item_id(page_id + 1),
+                )
             )
-        ):
-            if not self._get_is_fetchable(item_id):
-                continue
+            if self._get_is_fetchable(item_id)
+        ]
+
+        # Prefetched concurrently. The parents and kids of these items mostly fall in the same or
+        # already prefetched ranges, so walking up to each thread's root rarely needs a request.
+        items = self._fetch_items(item_ids)
+
+        if self._options.shard_count > 1:
+            # Each root item belongs to the shard owning its page, so shards only emit the roots in
+            # their own pages (comments are reached through them) and never overlap.
+            for item_id, data in zip(item_ids, items):
+                if data and "parent" not in data:
+                    yield self._make_root_thread(item_id, data)
+        else:
+            for item_id in item_ids:
+                if not self._get_is_fetchable(item_id):
+                    continue
+
+                if thread := self._fetch_item_thread(item_id):
+                    yield thread
 
-            yield self._fetch_item_thread(item_id)
+        next_page_id = self._get_shard_page_id(page_id - 1)
 
-        if page_id > 0:
-            new_state_item_id = self._calc_first_item_id(page_id) - 1
+        if next_page_id >= 0:
+            new_state_item_id = self._calc_first_item_id(next_page_id + 1) - 1
             return PageState(
                 url=f"https://news.ycombinator.com/item?id={new_state_item_id}",
                 page=state.page + 1,
             )
 
+    def get_thread_marker(self, thread: Thread):
+        if "descendants" in thread.data:
+            return str(thread.data["descendants"])
+
     def _fetch_thread_page_posts(self, thread: Thread, state: PageState):
+        # Breadth-first, one level of the comment tree at a time, so that all items of a level are
+        # fetched concurrently. Posts come out in the same order as a queue-based BFS.
         post_paths: list[tuple[str, ...]] = [()]
 
-        i = 0
-        while True:
-            post_path = post_paths[i]
-
-            if post_path:
-                post_id = post_path[-1]
-            else:
-                post_id = thread.path[-1]
-
-            firebase_url = f"https://hacker-news.firebaseio.com/v0/item/{post_id}.json"
-
-            response = self._session.get(firebase_url)
-            data = response.json()
-
-            if data:
-                self._register_item(int(post_id))
+        while post_paths:
+            post_ids = [
+                int(post_path[-1] if post_path else thread.path[-1])
+                for post_path in post_paths
+            ]
+            kid_post_paths: list[tuple[str, ...]] = []
+
+            for post_path, post_id, data in zip(
+                post_paths, post_ids, self._fetch_items(post_ids)
+            ):
+                if not data:
+                    logging.warning(f"Item at post_id={post_id} is null")
+                    continue
+
+                self._register_item(post_id)
                 yield Post(
                     path=thread.path,
                     subpath=post_path,
                     url=thread.url,
-                    origin=response.url,
+                    origin=self._get_item_firebase_url(post_id),
                     data=data,
                     author=data.get("by", ""),
                     creation_time=datetime.utcfromtimestamp(data.get("time")),
@@ -250,14 +327,9 @@ class HackernewsExtractor(Extractor):
                 )
 
                 for kid_id in data.get("kids", []):
-                    post_paths.append(post_path + (str(kid_id),))
+                    kid_post_paths.append(post_path + (str(kid_id),))
 
-            else:
-                logging.warning(f"Item at post_id={post_path[-1]} is null")
-
-            i += 1
-            if i == len(post_paths):
-                break
+            post_paths = kid_post_paths
 
 
 class HackernewsSpecificExtractor(HackernewsExtractor):
@@ -272,17 +344,16 @@ class HackernewsSpecificExtractor(HackernewsExtractor):
         return self.root
 
     def _fetch_board_page_threads(self, board: Board, state: PageState):
-        json = self._session.get(self.get_firebase_url()).json()
+        story_ids = self._session.get(self.get_firebase_url()).json()
 
-        for story_id in json:
-            firebase_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
-            response = self._session.get(firebase_url)
-            data = response.json()
+        for story_id, data in zip(story_ids, self._fetch_items(story_ids)):
+            if not data:
+                continue
 
             yield Thread(
                 path=(str(story_id),),
                 url=f"https://news.ycombinator.com/item?id={story_id}",
-                origin=response.url,
+                origin=self._get_item_firebase_url(story_id),
                 data=data,
                 title=data.get("title", ""),
             )
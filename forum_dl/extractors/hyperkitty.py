@@ -2,17 +2,28 @@
 from __future__ import annotations
 from typing import *  # type: ignore
 
+from base64 import b32encode
 from pathlib import PurePosixPath
 from urllib.parse import urljoin, urlparse
 import dateparser
+import hashlib
+import html
 import re
 
 from .common import normalize_url
 from .common import Extractor, ExtractorOptions, Board, Thread, Post, PageState
+from .common import DetectionCache
+from ..mbox import read_messages, thread_messages
+from ..mbox import get_message_author, get_message_time, get_message_text
 from ..session import Session
 from ..soup import Soup
 
 
+class HyperkittyExportState(PageState):
+    months: list[tuple[int, int]]
+    offset: int = 0
+
+
 class HyperkittyExtractor(Extractor):
     tests = [
         {
@@ -68,16 +79,17 @@ class HyperkittyExtractor(Extractor):
         },
     ]
 
+    _url_regex = re.compile(r"/archives/list/|/hyperkitty/")
+
     _reply_level_regex = re.compile(r"reply-level-(\d+)")
+    _month_href_regex = re.compile(r"/list/[^/]+/(\d\d\d\d)/(\d\d?)/$")
 
     @staticmethod
-    def _detect(session: Session, url: str, options: ExtractorOptions):
-        response = session.try_get(
-            normalize_url(url, append_slash=False),
-            should_cache=True,
-            should_retry=False,
-        )
-        soup = Soup(response.content)
+    def _detect(
+        session: Session, url: str, options: ExtractorOptions, cache: DetectionCache
+    ):
+        response = cache.get(normalize_url(url, append_slash=False))
+        soup = cache.parse(response)
 
         if extractor := HyperkittyExtractor.detect_postorius(
             session, url, soup, options
@@ -121,6 +133,10 @@ class HyperkittyExtractor(Extractor):
         base_url = normalize_url(urljoin(url, navbar_brand_anchor.get("href")))
         return HyperkittyExtractor(session, base_url, options)
 
+    def __init__(self, session: Session, base_url: str, options: ExtractorOptions):
+        super().__init__(session, base_url, options)
+        self._export_posts: dict[tuple[str, ...], list[Post]] = {}
+
     def _fetch_top_boards(self):
         pass
 
@@ -211,6 +227,9 @@ class HyperkittyExtractor(Extractor):
         if board == self.root:
             return None
 
+        if self._options.bulk:
+            return (yield from self._fetch_board_export_threads(board, state))
+
         if state.url == board.url:
             state.url = urljoin(state.url, "latest")
 
@@ -243,7 +262,99 @@ class HyperkittyExtractor(Extractor):
                     page=state.page + 1,
                 )
 
+    def _fetch_board_export_threads(self, board: Board, state: PageState):
+        # Bulk mode: one mbox export per month, downloaded concurrently, newest first. The state
+        # moves to a new page with every month.
+        if state.url == board.url:
+            response = self._session.get(board.url, should_cache=True)
+            soup = Soup(response.content)
+
+            months = {
+                (int(match.group(1)), int(match.group(2)))
+                for month_anchor in soup.find_all(
+                    "a", attrs={"href": self._month_href_regex}
+                )
+                if (match := self._month_href_regex.search(month_anchor.get("href")))
+            }
+
+            return HyperkittyExportState(
+                url=urljoin(board.url, f"export/{board.path[0]}.mbox.gz"),
+                page=state.page + 1,
+                months=sorted(months, reverse=True),
+            )
+
+        state = cast(HyperkittyExportState, state)
+        first_offset = state.offset
+        first_page = state.page
+
+        responses = self._session.map(
+            lambda month: self._session.get(
+                state.url,
+                params={
+                    "start": f"{month[0]:04}-{month[1]:02}-01",
+                    "end": (
+                        f"{month[0] + 1:04}-01-01"
+                        if month[1] == 12
+                        else f"{month[0]:04}-{month[1] + 1:02}-01"
+                    ),
+                },
+            ),
+            state.months[first_offset:],
+        )
+
+        for i, response in enumerate(responses):
+            state.offset = first_offset + i
+            state.page = first_page + i
+            yield from self._make_export_threads(board, response.url, response.content)
+
+    @staticmethod
+    def _get_message_id_hash(message_id: str):
+        # The ids Hyperkitty gives to threads and messages.
+        return b32encode(hashlib.sha1(message_id.encode()).digest()).decode()
+
+    def _make_export_threads(self, board: Board, origin: str, content: bytes):
+        self._export_posts.clear()
+
+        for messages in thread_messages(read_messages(content)):
+            root_message = messages[0][1]
+            thread_id = self._get_message_id_hash(messages[0][0][0])
+            path = board.path + (thread_id,)
+
+            self._export_posts[path] = []
+
+            for message_ids, message in messages:
+                message_id_hash = self._get_message_id_hash(message_ids[-1])
+
+                # As in normal mode, the root post has an empty subpath.
+                self._export_posts[path].append(
+                    Post(
+                        path=path,
+                        subpath=tuple(
+                            self._get_message_id_hash(message_id)
+                            for message_id in message_ids[1:]
+                        ),
+                        url=urljoin(board.url, f"message/{message_id_hash}/"),
+                        origin=origin,
+                        data={},
+                        author=get_message_author(message),
+                        creation_time=get_message_time(message),
+                        content=html.escape(get_message_text(message)),
+                    )
+                )
+
+            yield Thread(
+                path=path,
+                url=urljoin(board.url, f"thread/{thread_id}/"),
+                origin=origin,
+                data={},
+                title=str(root_message.get("Subject", "")),
+            )
+
     def _fetch_thread_page_posts(self, thread: Thread, state: PageState):
+        if thread.path in self._export_posts:
+            yield from self._export_posts.pop(thread.path)
+            return None
+
         origin = state.url
         response = self._session.get(origin)
 
@@ -10,8 +10,12 @@ import re
 
 from .common import normalize_url, regex_match
 from .common import Extractor, ExtractorOptions, Board, Thread, Post, PageState
+from .common import DetectionCache
 from ..session import Session
-from ..soup import Soup
+from ..soup import Soup, SoupStrainer
+
+if TYPE_CHECKING:
+    from requests import Response
 
 
 class HypermailPageState(PageState):
@@ -37,14 +41,15 @@ class HypermailExtractor(Extractor):
     _page_href_regex = re.compile(r"^(\d+)/index.html$")
     _post_href_regex = re.compile(r"^(\d+).html$")
 
+    # Messages are listed in the same part of each index page.
+    _messages_list_strainer = SoupStrainer("div", class_="messages-list")
+
     @staticmethod
-    def _detect(session: Session, url: str, options: ExtractorOptions):
-        response = session.try_get(
-            normalize_url(url, remove_suffixes=[], append_slash=False),
-            should_cache=True,
-            should_retry=False,
-        )
-        soup = Soup(response.content)
+    def _detect(
+        session: Session, url: str, options: ExtractorOptions, cache: DetectionCache
+    ):
+        response = cache.get(normalize_url(url, remove_suffixes=[], append_slash=False))
+        soup = cache.parse(response)
 
         _ = soup.find(
             "meta",
@@ -112,7 +117,7 @@ class HypermailExtractor(Extractor):
     def _fetch_board_page_threads(self, board: Board, state: PageState):
         if state.url == board.url:
             response = self._session.get(board.url)
-            soup = Soup(response.content)
+            soup = Soup(response.content, SoupStrainer("a", href=self._page_href_regex))
 
             page_anchors = soup.find_all("a", attrs={"href": self._page_href_regex})
             relative_urls = list(
@@ -129,7 +134,7 @@ class HypermailExtractor(Extractor):
         state = cast(HypermailPageState, state)
 
         response = self._session.get(state.url)
-        soup = Soup(response.content)
+        soup = Soup(response.content, self._messages_list_strainer)
 
         messages_list_div = cast(
             bs4.element.Tag, soup.find("div", class_="messages-list")
@@ -168,13 +173,13 @@ class HypermailExtractor(Extractor):
             state.url = urljoin(thread.url, ".")
 
         response = self._session.get(state.url)
-        soup = Soup(response.content)
+        soup = Soup(response.content, self._messages_list_strainer)
 
         root_anchor = soup.find("a", attrs={"href": f"{thread.path[-1]}.html"})
         root_pos = len(list(root_anchor.parents))
 
         href = root_anchor.get("href")
-        yield self._fetch_post(state, thread.path, (), urljoin(thread.url, href))
+        post_urls: list[tuple[tuple[str, ...], str]] = [((), urljoin(thread.url, href))]
 
         child_ul = root_anchor.find_next("ul")
         child_anchors = child_ul.find_all("a", attrs={"href": self._post_href_regex})
@@ -194,20 +199,22 @@ class HypermailExtractor(Extractor):
             else:
                 subpath[-(prev_depth - cur_depth - 1) :] = [post_id]
 
-            yield self._fetch_post(
-                state, thread.path, tuple(subpath), urljoin(state.url, href)
-            )
-
+            post_urls.append((tuple(subpath), urljoin(state.url, href)))
             prev_depth = cur_depth
 
-    def _fetch_post(
+        # All message URLs are known upfront, so messages are fetched concurrently.
+        responses = self._session.get_many(url for _, url in post_urls)
+
+        for (subpath, url), response in zip(post_urls, responses):
+            yield self._extract_post(thread.path, subpath, url, response)
+
+    def _extract_post(
         self,
-        state: PageState,
         path: tuple[str, ...],
         subpath: tuple[str, ...],
         url: str,
+        response: Response,
     ):
-        response = self._session.get(url)
         soup = Soup(response.content)
 
         author_meta = soup.find("meta", attrs={"name": "Author"})
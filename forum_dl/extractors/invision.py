@@ -7,6 +7,7 @@ import re
 from .common import (
     HtmlExtractor,
     ExtractorOptions,
+    DetectionCache,
     Board,
     Thread,
     Post,
@@ -14,7 +15,7 @@ from .common import (
     regex_match,
 )
 from ..session import Session
-from ..soup import Soup, SoupTag
+from ..soup import SoupTag
 
 if TYPE_CHECKING:
     from requests import Response
@@ -72,15 +73,21 @@ class InvisionExtractor(HtmlExtractor):
         },
     ]
 
+    _url_regex = re.compile(r"/(topic|forum)/\d+-")
+
     _board_item_css = 'li[data-controller="forums.frontforum.topicRow"]'
     _board_next_page_css = 'link[rel="next"]'
+    _board_page_css = ".ipsPagination_page a, .ipsPagination_last a"
     _thread_item_css = "article.ipsComment"
     _thread_next_page_css = 'link[rel="next"]'
+    _thread_page_css = ".ipsPagination_page a, .ipsPagination_last a"
 
     @staticmethod
-    def _detect(session: Session, url: str, options: ExtractorOptions):
-        response = session.try_get(url, should_cache=True, should_retry=False)
-        soup = Soup(response.content)
+    def _detect(
+        session: Session, url: str, options: ExtractorOptions, cache: DetectionCache
+    ):
+        response = cache.get(url)
+        soup = cache.parse(response)
 
         breadcrumbs_ul = soup.find("ul", attrs={"data-role": "breadcrumbList"})
         breadcrumb_lis = breadcrumbs_ul.find_all("li")
@@ -96,7 +103,7 @@ class InvisionExtractor(HtmlExtractor):
         self._are_subboards_fetched[self.root.path] = True
 
         response = self._session.get(self.base_url, should_cache=True)
-        soup = Soup(response.content)
+        soup = self._parse(response.content)
 
         category_lis = soup.find_all("li", class_="cForumRow")
         for category_li in category_lis:
@@ -134,7 +141,7 @@ class InvisionExtractor(HtmlExtractor):
             return
 
         response = self._session.get(board.url, should_cache=True)
-        soup = Soup(response.content)
+        soup = self._parse(response.content)
 
         subboard_divs = soup.find_all("div", class_="cForumGrid")
         for subboard_div in subboard_divs:
@@ -153,7 +160,7 @@ class InvisionExtractor(HtmlExtractor):
 
     def _get_node_from_url(self, url: str):
         response = self._session.get(url, should_cache=True)
-        soup = Soup(response.content)
+        soup = self._parse(response.content)
 
         breadcrumbs_ul = soup.find("ul", attrs={"data-role": "breadcrumbList"})
         breadcrumb_lis = breadcrumbs_ul.find_all("li")
@@ -216,7 +223,7 @@ class InvisionExtractor(HtmlExtractor):
         url_div = author_div.find("div")
         post_id = regex_match(re.compile(r"^elComment_(\d+)"), tag.get("id")).group(1)
 
-        return Post(
+        post = Post(
             path=thread.path,
             subpath=(post_id,),
             url=url_div.find("a").get("href"),
@@ -226,3 +233,5 @@ class InvisionExtractor(HtmlExtractor):
             creation_time=time_tag.get("datetime"),
             content="".join(str(v) for v in content_div.contents),
         )
+
+        return post, content_div
@@ -9,8 +9,9 @@ import re
 
 from .common import get_relative_url, normalize_url, regex_match
 from .common import HtmlExtractor, ExtractorOptions, Board, Thread, Post, PageState
+from .common import DetectionCache
 from ..session import Session
-from ..soup import Soup, SoupTag
+from ..soup import SoupTag, SoupStrainer
 
 if TYPE_CHECKING:
     from requests import Response
@@ -199,25 +200,33 @@ class PhpbbExtractor(HtmlExtractor):
         },
     ]
 
+    _url_regex = re.compile(r"/(viewtopic|viewforum)\.php")
+
     _board_item_css = "a.topictitle"
     _board_next_page_css = ".next a"
+    _board_page_css = ".pagination li a.button"
     _thread_item_css = "div.post"
     _thread_next_page_css = ".next a"
+    _thread_page_css = ".pagination li a.button"
+
+    # Board indexes are parsed only where the boards are listed.
+    _top_boards_strainer = SoupStrainer("div", class_="forabg")
+    _subboards_strainer = SoupStrainer("a", class_="forumtitle")
 
     @staticmethod
-    def _detect(session: Session, url: str, options: ExtractorOptions):
+    def _detect(
+        session: Session, url: str, options: ExtractorOptions, cache: DetectionCache
+    ):
         # Check for the existence of "viewforum.php".
-        response = session.try_get(
+        response = cache.get(
             urljoin(
                 normalize_url(url, remove_suffixes=["viewforum.php", "viewtopic.php"]),
                 "viewforum.php",
-            ),
-            should_cache=True,
-            should_retry=False,
+            )
         )
 
         # A rather crude way to detect: we look for a <html> tag with "dir" attribute.
-        soup = Soup(response.text)
+        soup = cache.parse(response)
         soup.find("html", attrs={"dir": True})
 
         return PhpbbExtractor(
@@ -284,7 +293,7 @@ class PhpbbExtractor(HtmlExtractor):
         self._are_subboards_fetched[self.root.path] = True
 
         response = self._session.get(self.base_url, should_cache=True)
-        soup = Soup(response.content)
+        soup = self._parse(response.content, self._top_boards_strainer)
 
         board_lis = soup.find_all("div", class_="forabg")
 
@@ -346,7 +355,7 @@ class PhpbbExtractor(HtmlExtractor):
         except ValueError:
             return
 
-        soup = Soup(response.content)
+        soup = self._parse(response.content, self._subboards_strainer)
 
         subboard_anchors = soup.find_all("a", class_="forumtitle")
 
@@ -400,7 +409,7 @@ class PhpbbExtractor(HtmlExtractor):
             raise ValueError
         elif parts[-1] == "viewtopic.php":
             topic_id = parse_qs(parsed_url.query)["t"][0]
-            soup = Soup(response.content)
+            soup = self._parse(response.content)
             breadcrumbs = soup.find(class_="breadcrumbs")
 
             breadcrumb_anchors = breadcrumbs.find_all("a", attrs={"itemprop": "item"})
@@ -465,7 +474,7 @@ class PhpbbExtractor(HtmlExtractor):
             creation_time = dateparser.parse(time_tag.get("datetime"))
         else:
             # Date-string begins right after &raquo;.
-            date_match = re.search("»(.+)", author_p.tag.get_text(), re.MULTILINE)
+            date_match = re.search("»(.+)", author_p.text, re.MULTILINE)
 
             if date_match:
                 creation_time = dateparser.parse(date_match.group(1))
@@ -475,7 +484,7 @@ class PhpbbExtractor(HtmlExtractor):
         url_h3 = tag.find("h3")
         url_anchor = url_h3.find("a")
 
-        return Post(
+        post = Post(
             path=thread.path,
             subpath=(regex_match(id_div_regex, id_div.get("id")).group(1),),
             url=urljoin(response.url, url_anchor.get("href")),
@@ -485,3 +494,5 @@ class PhpbbExtractor(HtmlExtractor):
             creation_time=creation_time,
             content=str("".join(str(v) for v in content_div.contents)),
         )
+
+        return post, content_div
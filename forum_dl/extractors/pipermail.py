@@ -6,13 +6,20 @@ from pathlib import PurePosixPath
 from urllib.parse import urljoin, urlparse, urlunparse
 import dateparser
 import bs4
+import html
 import re
 
 from .common import normalize_url, regex_match
 from .common import Extractor, ExtractorOptions, Board, Thread, Post, PageState
+from .common import DetectionCache
 from ..exceptions import TagSearchError
+from ..mbox import read_messages, thread_messages
+from ..mbox import get_message_author, get_message_time, get_message_text
 from ..session import Session
-from ..soup import Soup
+from ..soup import Soup, SoupStrainer
+
+if TYPE_CHECKING:
+    from requests import Response
 
 
 class PipermailPageState(PageState):
@@ -49,18 +56,29 @@ class PipermailExtractor(Extractor):
         },
     ]
 
+    _url_regex = re.compile(r"/pipermail/|/mailman/listinfo")
+
     _listinfo_href_regex = re.compile(r"^listinfo/(.+)$")
     _listinfo_title_regex = re.compile(r"^(.+) Info Page$")
     _pipermail_page_href_regex = re.compile(
         r"^\d\d\d\d-(January|February|March|April|May|June|July|August|September|October|November|December)/thread.html$"
     )
+    _archive_href_regex = re.compile(
+        r"^\d\d\d\d-(January|February|March|April|May|June|July|August|September|October|November|December)\.txt(\.gz)?$"
+    )
     _post_href_regex = re.compile(r"^(\d+).html$")
     _root_post_comment_regex = re.compile(r"^0 ([^-]+)- $")
     _child_post_comment_regex = re.compile(r"^(1|2|3) ([^-]+)-(.*?)-? $")
 
+    # Thread indexes can be large, and the threads are all listed in the lists of their
+    # bodies, together with the comments that give their structure.
+    _thread_index_strainer = SoupStrainer("ul")
+
     @staticmethod
-    def _detect(session: Session, url: str, options: ExtractorOptions):
-        response = session.try_get(url, should_cache=True, should_retry=False)
+    def _detect(
+        session: Session, url: str, options: ExtractorOptions, cache: DetectionCache
+    ):
+        response = cache.get(url)
         resolved_url = normalize_url(response.url, append_slash=False)
 
         parsed_url = urlparse(resolved_url)
@@ -111,6 +129,10 @@ class PipermailExtractor(Extractor):
                 options,
             )
 
+    def __init__(self, session: Session, base_url: str, options: ExtractorOptions):
+        super().__init__(session, base_url, options)
+        self._archive_posts: dict[tuple[str, ...], list[Post]] = {}
+
     def _fetch_top_boards(self):
         pass
 
@@ -187,7 +209,7 @@ class PipermailExtractor(Extractor):
         # TODO use a for loop over _fetch_lazy_subboard() instead
         url = normalize_url(urljoin(self.base_url, f"mailman/listinfo"))
         response = self._session.get(url, should_cache=True)
-        soup = Soup(response.content)
+        soup = Soup(response.content, SoupStrainer("a", href=self._listinfo_href_regex))
 
         listinfo_anchors = soup.find_all("a", attrs={"href": self._listinfo_href_regex})
 
@@ -205,11 +227,17 @@ class PipermailExtractor(Extractor):
             pipermail_url = urljoin(self.base_url, f"pipermail/{board_id}")
 
             response = self._session.get(pipermail_url)
-            soup = Soup(response.content)
 
-            page_anchors = soup.find_all(
-                "a", attrs={"href": self._pipermail_page_href_regex}
-            )
+            # In bulk mode, whole months are read from their text archives instead of their
+            # thread indexes.
+            if self._options.bulk:
+                page_href_regex = self._archive_href_regex
+            else:
+                page_href_regex = self._pipermail_page_href_regex
+
+            soup = Soup(response.content, SoupStrainer("a", href=page_href_regex))
+
+            page_anchors = soup.find_all("a", attrs={"href": page_href_regex})
 
             relative_urls = list(
                 reversed([page_anchor.get("href") for page_anchor in page_anchors])
@@ -226,8 +254,26 @@ class PipermailExtractor(Extractor):
 
         state = cast(PipermailPageState, state)
 
-        response = self._session.get(state.url)
-        soup = Soup(response.content)
+        if self._options.bulk:
+            yield from self._fetch_archive_threads(board, state)
+        else:
+            yield from self._fetch_thread_index_threads(board, state)
+
+        if state.relative_urls:
+            relative_url = state.relative_urls.pop()
+            board_id = board.path[0]
+            return PipermailPageState(
+                url=urljoin(
+                    urljoin(self.base_url, f"pipermail/{board_id}/"), relative_url
+                ),
+                page=state.page + 1,
+                relative_urls=state.relative_urls,
+            )
+
+    def _fetch_thread_index_threads(self, board: Board, state: PageState):
+        # Thread pages come back to the same index.
+        response = self._session.get(state.url, should_cache=True)
+        soup = Soup(response.content, self._thread_index_strainer)
 
         root_comments = soup.soup.find_all(
             string=lambda text: isinstance(text, bs4.element.Comment)
@@ -249,23 +295,47 @@ class PipermailExtractor(Extractor):
                 title=thread_anchor.string,
             )
 
-        if state.relative_urls:
-            relative_url = state.relative_urls.pop()
-            board_id = board.path[0]
-            return PipermailPageState(
-                url=urljoin(
-                    urljoin(self.base_url, f"pipermail/{board_id}/"), relative_url
-                ),
-                page=state.page + 1,
-                relative_urls=state.relative_urls,
+    def _fetch_archive_threads(self, board: Board, state: PageState):
+        response = self._session.get(state.url)
+        self._archive_posts.clear()
+
+        for messages in thread_messages(read_messages(response.content)):
+            root_message = messages[0][1]
+            path = board.path + (messages[0][0][0],)
+
+            # As with thread indexes, the subpaths of replies don't include the root post.
+            self._archive_posts[path] = [
+                Post(
+                    path=path,
+                    subpath=message_ids[1:] or message_ids,
+                    url=response.url,
+                    origin=response.url,
+                    data={},
+                    author=get_message_author(message),
+                    creation_time=get_message_time(message),
+                    content=html.escape(get_message_text(message)),
+                )
+                for message_ids, message in messages
+            ]
+
+            yield Thread(
+                path=path,
+                url=response.url,
+                origin=response.url,
+                data={},
+                title=str(root_message.get("Subject", "")),
             )
 
     def _fetch_thread_page_posts(self, thread: Thread, state: PageState):
+        if thread.path in self._archive_posts:
+            yield from self._archive_posts.pop(thread.path)
+            return None
+
         if state.url == thread.url:
             state.url = urljoin(thread.url, "thread.html")
 
-        response = self._session.get(state.url)
-        soup = Soup(response.content)
+        response = self._session.get(state.url, should_cache=True)
+        soup = Soup(response.content, self._thread_index_strainer)
 
         root_anchor = soup.find("a", attrs={"href": f"{thread.path[-1]}.html"})
         root_comment = root_anchor.tag.find_previous(
@@ -274,7 +344,9 @@ class PipermailExtractor(Extractor):
         if not isinstance(root_comment, bs4.element.Comment):
             raise TagSearchError
 
-        yield self._fetch_post(state, thread.path, (thread.path[-1],), thread.url)
+        post_urls: list[tuple[tuple[str, ...], str]] = [
+            ((thread.path[-1],), thread.url)
+        ]
 
         thread_long_id = regex_match(
             self._root_post_comment_regex, str(root_comment)
@@ -311,20 +383,22 @@ class PipermailExtractor(Extractor):
             else:
                 subpath[-(len(prev_long_ids) - len(cur_long_ids) - 1) :] = [post_id]
 
-            yield self._fetch_post(
-                state, thread.path, tuple(subpath), urljoin(state.url, href)
-            )
-
+            post_urls.append((tuple(subpath), urljoin(state.url, href)))
             prev_long_ids = cur_long_ids
 
-    def _fetch_post(
+        # All message URLs are known upfront, so messages are fetched concurrently.
+        responses = self._session.get_many(url for _, url in post_urls)
+
+        for (subpath, url), response in zip(post_urls, responses):
+            yield self._extract_post(thread.path, subpath, url, response)
+
+    def _extract_post(
         self,
-        state: PageState,
         path: tuple[str, ...],
         subpath: tuple[str, ...],
         url: str,
+        response: Response,
     ):
-        response = self._session.get(url)
         soup = Soup(response.content)
 
         content_pre = soup.find("pre")
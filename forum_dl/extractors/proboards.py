@@ -9,8 +9,9 @@ import re
 
 from .common import regex_match
 from .common import HtmlExtractor, ExtractorOptions, Board, Thread, Post, PageState
+from .common import DetectionCache
 from ..session import Session
-from ..soup import Soup, SoupTag
+from ..soup import SoupTag
 
 if TYPE_CHECKING:
     from requests import Response
@@ -191,6 +192,9 @@ class ProboardsExtractor(HtmlExtractor):
         },
     ]
 
+    _url_regex = re.compile(r"^https?://[^/]+\.proboards\.com(/|$)")
+    is_detected_from_url = True
+
     _board_item_css = 'a.thread-link:not([href^="/threads/recent"])'
     _thread_item_css = "tr.item"
     _board_next_page_css = ".next a[href]"
@@ -202,7 +206,9 @@ class ProboardsExtractor(HtmlExtractor):
     _post_id_regex = re.compile(r"^post-(\d+)$")
 
     @staticmethod
-    def _detect(session: Session, url: str, options: ExtractorOptions):
+    def _detect(
+        session: Session, url: str, options: ExtractorOptions, cache: DetectionCache
+    ):
         parsed_url = urlparse(url)
 
         if parsed_url.netloc.endswith("proboards.com"):
@@ -214,7 +220,7 @@ class ProboardsExtractor(HtmlExtractor):
         response = self._session.try_get(
             self.base_url, should_cache=True, should_retry=False
         )
-        soup = Soup(response.content)
+        soup = self._parse(response.content)
 
         category_anchors = soup.find_all("a", attrs={"name": self._category_name_regex})
 
@@ -262,7 +268,7 @@ class ProboardsExtractor(HtmlExtractor):
             return
 
         response = self._session.get(board.url, should_cache=True)
-        soup = Soup(response.content)
+        soup = self._parse(response.content)
 
         subboard_trs = soup.find_all("tr", id=self._board_id_regex)
         for subboard_tr in subboard_trs:
@@ -289,7 +295,7 @@ class ProboardsExtractor(HtmlExtractor):
 
         if url_parts[1] == "thread":
             response = self._session.get(url, should_cache=True)
-            soup = Soup(response.content)
+            soup = self._parse(response.content)
 
             breadcrumbs_div = soup.find("div", class_="nav-tree-wrapper")
             breadcrumb_anchors = breadcrumbs_div.find_all(
@@ -349,7 +355,7 @@ class ProboardsExtractor(HtmlExtractor):
         message_div = tag.find("div", class_="message")
         post_id = regex_match(self._post_id_regex, tag.get("id")).group(1)
 
-        return Post(
+        post = Post(
             path=thread.path,
             subpath=(post_id,),
             url=urljoin(self.base_url, f"post/{post_id}/thread"),
@@ -361,3 +367,5 @@ class ProboardsExtractor(HtmlExtractor):
             ),
             content=str("".join(str(v) for v in message_div.contents)),
         )
+
+        return post, message_div
@@ -8,8 +8,9 @@ import re
 
 from .common import normalize_url, regex_match, regex_search
 from .common import HtmlExtractor, ExtractorOptions, Board, Thread, Post, PageState
+from .common import DetectionCache
 from ..session import Session
-from ..soup import Soup, SoupTag
+from ..soup import SoupTag
 
 if TYPE_CHECKING:
     from requests import Response
@@ -226,10 +227,14 @@ class SimplemachinesExtractor(HtmlExtractor):
         },
     ]
 
+    _url_regex = re.compile(r"index\.php\?(topic|board)=\d+")
+
     _board_item_css = 'span[id^="msg_"]'
     _thread_item_css = "div.post_wrapper, :has(> .postarea)"
     _board_next_page_css = 'a.nav_page:has(span.next_page), a.navPages:-soup-contains("Next"), strong + a.navPages'
+    _board_page_css = "a.nav_page, a.navPages"
     _thread_next_page_css = 'a.nav_page:has(span.next_page), a.navPages:-soup-contains("Next"), strong + a.navPages'
+    _thread_page_css = "a.nav_page, a.navPages"
 
     _category_id_regex = re.compile(r"^c(\d+)$")
     _board_id_regex = re.compile(r"^b(\d+)$")
@@ -238,9 +243,11 @@ class SimplemachinesExtractor(HtmlExtractor):
     _subject_id_regex = re.compile(r"^subject_(\d+)$")
 
     @staticmethod
-    def _detect(session: Session, url: str, options: ExtractorOptions):
-        response = session.try_get(url, should_cache=True, should_retry=False)
-        soup = Soup(response.content)
+    def _detect(
+        session: Session, url: str, options: ExtractorOptions, cache: DetectionCache
+    ):
+        response = cache.get(url)
+        soup = cache.parse(response)
 
         link = soup.find("link", attrs={"rel": "contents"})
         base_url = normalize_url(link.get("href"))
@@ -260,7 +267,7 @@ class SimplemachinesExtractor(HtmlExtractor):
         self._are_subboards_fetched[self.root.path] = True
 
         response = self._session.get(self.base_url, should_cache=True)
-        soup = Soup(response.content)
+        soup = self._parse(response.content)
 
         category_anchors = soup.find_all("a", id=self._category_id_regex)
         for category_anchor in category_anchors:
@@ -316,7 +323,7 @@ class SimplemachinesExtractor(HtmlExtractor):
             return
 
         response = self._session.get(board.url, should_cache=True)
-        soup = Soup(response.content)
+        soup = self._parse(response.content)
 
         subboard_anchors = soup.find_all("a", attrs={"id": self._board_id_regex})
 
@@ -342,7 +349,7 @@ class SimplemachinesExtractor(HtmlExtractor):
 
     def _get_node_from_url(self, url: str):
         response = self._session.get(url, should_cache=True)
-        soup = Soup(response.content)
+        soup = self._parse(response.content)
 
         breadcrumbs = soup.try_find(class_="navigate_section")
         if not breadcrumbs:
@@ -413,7 +420,7 @@ class SimplemachinesExtractor(HtmlExtractor):
             re.compile(
                 r"(January|February|March|April|May|June|July|August|September|October|November|December|Yesterday|Today) [a-zA-Z0-9,: ]+"
             ),
-            time_tag.tag.get_text(),  # Get rid of HTML tags.
+            time_tag.text,  # Get rid of HTML tags.
         ).group(0)
 
         poster_div = tag.find("div", class_="poster")
@@ -424,7 +431,7 @@ class SimplemachinesExtractor(HtmlExtractor):
         else:
             author = poster_h4.string.strip()
 
-        return Post(
+        post = Post(
             path=thread.path,
             subpath=(regex_match(self._div_id_regex, msg_div.get("id")).group(1),),
             url=subject_tag.find("a").get("href"),
@@ -434,3 +441,5 @@ class SimplemachinesExtractor(HtmlExtractor):
             creation_time=dateparser.parse(date),
             content="".join(str(v) for v in msg_div.contents).strip(),
         )
+
+        return post, msg_div
@@ -7,8 +7,9 @@ import re
 
 from .common import regex_match
 from .common import HtmlExtractor, ExtractorOptions, Board, Thread, Post, PageState
+from .common import DetectionCache
 from ..session import Session
-from ..soup import Soup, SoupTag
+from ..soup import SoupTag
 
 if TYPE_CHECKING:
     from requests import Response
@@ -213,17 +214,23 @@ class VbulletinExtractor(HtmlExtractor):
         },
     ]
 
+    _url_regex = re.compile(r"/(showthread|forumdisplay)\.php")
+
     _board_item_css = "tr.topic-item"
     _board_next_page_css = "a.right-arrow[href]"
+    _board_page_css = "a.js-pagenav-button"
     _thread_item_css = "li.b-post"
     _thread_next_page_css = "a.right-arrow[href]"
+    _thread_page_css = "a.js-pagenav-button"
 
     _forum_id_regex = re.compile(r"^forum(\d+)$")
 
     @staticmethod
-    def _detect(session: Session, url: str, options: ExtractorOptions):
-        response = session.try_get(url, should_cache=True, should_retry=False)
-        soup = Soup(response.content)
+    def _detect(
+        session: Session, url: str, options: ExtractorOptions, cache: DetectionCache
+    ):
+        response = cache.get(url)
+        soup = cache.parse(response)
 
         generator_meta = soup.find("meta", attrs={"name": "generator"})
         if not generator_meta.get("content").startswith("vBulletin"):
@@ -236,7 +243,7 @@ class VbulletinExtractor(HtmlExtractor):
         self._are_subboards_fetched[self.root.path] = True
 
         response = self._session.get(self.base_url, should_cache=True)
-        soup = Soup(response.content)
+        soup = self._parse(response.content)
 
         trs = soup.find_all("tr", class_=["category-header", "forum-item"])
         category_id = ""
@@ -276,7 +283,7 @@ class VbulletinExtractor(HtmlExtractor):
             return
 
         response = self._session.get(board.url, should_cache=True)
-        soup = Soup(response.content)
+        soup = self._parse(response.content)
 
         trs = soup.find_all("tr", class_="forum-item")
         for tr in trs:
@@ -293,7 +300,7 @@ class VbulletinExtractor(HtmlExtractor):
 
     def _get_node_from_url(self, url: str):
         response = self._session.get(url, should_cache=True)
-        soup = Soup(response.content)
+        soup = self._parse(response.content)
 
         breadcrumb_anchors = soup.find_all("a", class_="crumb-link")
 
@@ -359,7 +366,7 @@ class VbulletinExtractor(HtmlExtractor):
         time_tag = tag.find("time", attrs={"itemprop": "dateCreated"})
         post_id = tag.get("data-node-id")
 
-        return Post(
+        post = Post(
             path=thread.path,
             subpath=(post_id,),
             url=url_anchor.get("href"),
@@ -369,3 +376,5 @@ class VbulletinExtractor(HtmlExtractor):
             creation_time=time_tag.get("datetime"),
             content="".join(str(v) for v in content_div.contents).strip(),
         )
+
+        return post, content_div
@@ -7,8 +7,9 @@ import re
 
 from .common import normalize_url, regex_match
 from .common import HtmlExtractor, ExtractorOptions, Board, Thread, Post, PageState
+from .common import DetectionCache
 from ..session import Session
-from ..soup import Soup, SoupTag
+from ..soup import SoupTag
 
 if TYPE_CHECKING:
     from requests import Response
@@ -262,10 +263,14 @@ class XenforoExtractor(HtmlExtractor):
         },
     ]
 
+    _url_regex = re.compile(r"/(threads|forums)/[^/]+\.\d+")
+
     _board_item_css = ".structItem--thread"
     _board_next_page_css = "a.pageNav-jump--next"
+    _board_page_css = ".pageNav-page a"
     _thread_item_css = "article.message, .MessageCard"
     _thread_next_page_css = "a.pageNav-jump--next"
+    _thread_page_css = ".pageNav-page a"
 
     _board_class_regex = re.compile(r"^node--id(\d+)$")
     _thread_class_regex = re.compile(r"^js-threadListItem-(\d+)$")
@@ -273,17 +278,15 @@ class XenforoExtractor(HtmlExtractor):
     _post_id_regex = re.compile(r"^post-(\d+)$")
 
     @staticmethod
-    def _detect(session: Session, url: str, options: ExtractorOptions):
-        response = session.try_get(
-            normalize_url(url, remove_suffixes=[], append_slash=False),
-            should_cache=True,
-            should_retry=False,
-        )
+    def _detect(
+        session: Session, url: str, options: ExtractorOptions, cache: DetectionCache
+    ):
+        response = cache.get(normalize_url(url, remove_suffixes=[], append_slash=False))
 
         if not re.search(r'<html[^>]+id="XF"', response.text, re.MULTILINE):
             return None
 
-        soup = Soup(response.content)
+        soup = cache.parse(response)
 
         data_nav_id_anchor = soup.try_find("a", attrs={"data-nav-id": "forums"})
         if data_nav_id_anchor:
@@ -300,7 +303,7 @@ class XenforoExtractor(HtmlExtractor):
         self._are_subboards_fetched[self.root.path] = True
 
         response = self._session.get(self.base_url, should_cache=True)
-        soup = Soup(response.content)
+        soup = self._parse(response.content)
 
         block_divs = soup.find_all("div", class_="block")
         for block_div in block_divs:
@@ -315,7 +318,7 @@ class XenforoExtractor(HtmlExtractor):
                     ).group(1)
                 except:
                     continue
-            elif category_span := block_div.tag.find_previous_sibling(
+            elif category_span := block_div.try_find_previous_sibling(
                 "span", class_="u-anchorTarget"
             ):
                 url = urljoin(response.url, f"#{category_span.get('id')}")
@@ -368,7 +371,7 @@ class XenforoExtractor(HtmlExtractor):
             return
 
         response = self._session.get(board.url, should_cache=True)
-        soup = Soup(response.content)
+        soup = self._parse(response.content)
 
         node_id_divs = soup.find_all("div", class_=self._board_class_regex)
 
@@ -393,7 +396,7 @@ class XenforoExtractor(HtmlExtractor):
 
     def _get_node_from_url(self, url: str):
         response = self._session.get(url, should_cache=True)
-        soup = Soup(response.content)
+        soup = self._parse(response.content)
 
         if breadcrumbs_ul := soup.try_find("ul", class_="p-breadcrumbs"):
             breadcrumb_anchors = breadcrumbs_ul.find_all(
@@ -493,7 +496,7 @@ class XenforoExtractor(HtmlExtractor):
 
         bbwrapper_div = tag.find("div", class_="bbWrapper")
 
-        return Post(
+        post = Post(
             path=thread.path,
             subpath=subpath,
             url=urljoin(state.url, url_anchor.get("href")),
@@ -503,3 +506,5 @@ class XenforoExtractor(HtmlExtractor):
             creation_time=time_tag.get("datetime"),
             content=bbwrapper_div.string,
         )
+
+        return post, bbwrapper_div
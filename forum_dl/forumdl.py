@@ -2,11 +2,16 @@
 from __future__ import annotations
 from typing import *  # type: ignore
 
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import quote_plus
+import logging
+import os
 
 from . import extractors
 from . import writers
-from .session import SessionOptions
+from .writers import jsonl
+from .session import Session, SessionOptions, SessionPool
 from .extractors.common import ExtractorOptions
 from .writers.common import WriterOptions
 
@@ -19,15 +24,76 @@ class ForumDl:
         session_options: SessionOptions,
         extractor_options: ExtractorOptions,
         writer_options: WriterOptions,
+        jobs: int = 1,
     ):
-        for url in urls:
-            self.download_url(
-                url,
-                output_format,
-                session_options,
-                extractor_options,
-                writer_options,
-            )
+        jobs = max(1, min(jobs, len(urls)))
+
+        # Jobs share the pool, so per-host politeness also holds across URLs on the same host.
+        pool = SessionPool(session_options)
+        counts: Counter[str] = Counter()
+        errors: list[Exception] = []
+
+        try:
+            if jobs == 1:
+                for url in urls:
+                    counts += self.download_url(
+                        url,
+                        output_format,
+                        session_options,
+                        extractor_options,
+                        writer_options,
+                        pool=pool,
+                    )
+            else:
+                with ThreadPoolExecutor(max_workers=jobs) as executor:
+                    futures = {
+                        executor.submit(
+                            self.download_url,
+                            url,
+                            output_format,
+                            session_options,
+                            extractor_options,
+                            self._job_writer_options(
+                                url, output_format, writer_options
+                            ),
+                            pool=pool,
+                        ): url
+                        for url in urls
+                    }
+
+                    for future in as_completed(futures):
+                        try:
+                            counts += future.result()
+                        except Exception as e:
+                            logging.error(f"Failed to download {futures[future]}: {e}")
+                            errors.append(e)
+        finally:
+            pool.close()
+
+        logging.info(
+            f"Downloaded {len(urls) - len(errors)} of {len(urls)} URLs:"
+            f" {counts['boards']} boards, {counts['threads']} threads,"
+            f" {counts['posts']} posts, {counts['files']} files"
+        )
+
+        if errors:
+            raise errors[0]
+
+    def _job_writer_options(
+        self, url: str, output_format: str, writer_options: WriterOptions
+    ):
+        # Parallel jobs can't share one output, so OUTFILE becomes a directory with one output per URL.
+        # stdout is left as is, as entries are written one line at a time.
+        if writer_options.output_path in ("", "-") or output_format == "warc":
+            return writer_options
+
+        os.makedirs(writer_options.output_path, exist_ok=True)
+
+        return writer_options.copy(
+            update={
+                "output_path": os.path.join(writer_options.output_path, quote_plus(url))
+            }
+        )
 
     def download_url(
         self,
@@ -36,17 +102,29 @@ class ForumDl:
         session_options: SessionOptions,
         extractor_options: ExtractorOptions,
         writer_options: WriterOptions,
-    ):
-        extractor = extractors.find(url, session_options, extractor_options)
+        *,
+        pool: SessionPool | None = None,
+    ) -> Counter[str]:
+        session = pool.get(url) if pool else Session(session_options)
+        extractor = extractors.find(url, session, extractor_options)
 
         if extractor:
             extractor.fetch()
-            writer_options.output_path = writer_options.output_path or quote_plus(url)
+            writer_options = writer_options.copy(
+                update={"output_path": writer_options.output_path or quote_plus(url)}
+            )
             writer = writers.find(
                 extractor, output_format, session_options, writer_options
             )
             writer.write(url)
 
+            return writer.counts
+
+        return Counter()
+
+    def merge(self, input_paths: list[str], output_path: str):
+        jsonl.merge(input_paths, output_path)
+
     def list_extractors(self):
         return extractors.modules
 
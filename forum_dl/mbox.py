@@ -0,0 +1,128 @@
+# pyright: strict
+from __future__ import annotations
+from typing import *  # type: ignore
+
+from email.header import decode_header, make_header
+from email.message import EmailMessage
+from email.parser import BytesParser
+from email.utils import parseaddr, parsedate_to_datetime
+import email.policy
+import gzip
+import io
+import re
+
+_from_line_regex = re.compile(rb"^From \S+.*\d\d:\d\d:\d\d")
+_message_id_regex = re.compile(r"<([^<>]+)>")
+_obfuscated_addr_regex = re.compile(r"^(\S+) at (\S+)")
+
+
+def read_messages(content: bytes) -> Generator[EmailMessage, None, None]:
+    # Archives may come gzipped or already decoded, depending on the server's Content-Encoding.
+    if content.startswith(b"\x1f\x8b"):
+        file = gzip.GzipFile(fileobj=io.BytesIO(content))
+    else:
+        file = io.BytesIO(content)
+
+    parser = BytesParser(_class=EmailMessage, policy=email.policy.default)
+    lines: list[bytes] = []
+
+    for line in file:
+        if _from_line_regex.match(line):
+            if lines:
+                yield cast(EmailMessage, parser.parsebytes(b"".join(lines)))
+
+            lines = []
+        else:
+            lines.append(line)
+
+    if lines:
+        yield cast(EmailMessage, parser.parsebytes(b"".join(lines)))
+
+
+def get_message_id(message: EmailMessage):
+    if match := _message_id_regex.search(str(message.get("Message-ID", ""))):
+        return match.group(1)
+
+    return None
+
+
+def _get_referenced_ids(message: EmailMessage):
+    # Closest ancestor first.
+    in_reply_to = _message_id_regex.findall(str(message.get("In-Reply-To", "")))
+    references = _message_id_regex.findall(str(message.get("References", "")))
+    return in_reply_to + list(reversed(references))
+
+
+def thread_messages(
+    messages: Iterable[EmailMessage],
+) -> Generator[list[tuple[tuple[str, ...], EmailMessage]], None, None]:
+    # Yields threads in the order of their first messages, as lists of messages with the message
+    # ids of their ancestors and themselves, depth-first. Only earlier messages can be parents, so
+    # broken headers can't make cycles.
+    positions: dict[str, int] = {}
+    message_list: list[tuple[str, EmailMessage]] = []
+
+    for message in messages:
+        message_id = get_message_id(message) or f"{len(message_list)}"
+
+        if message_id not in positions:
+            positions[message_id] = len(message_list)
+            message_list.append((message_id, message))
+
+    children: dict[str, list[str]] = {}
+    root_ids: list[str] = []
+
+    for position, (message_id, message) in enumerate(message_list):
+        for parent_id in _get_referenced_ids(message):
+            if positions.get(parent_id, position) < position:
+                children.setdefault(parent_id, []).append(message_id)
+                break
+        else:
+            root_ids.append(message_id)
+
+    for root_id in root_ids:
+        thread: list[tuple[tuple[str, ...], EmailMessage]] = []
+        stack: list[tuple[str, ...]] = [(root_id,)]
+
+        while stack:
+            ids = stack.pop()
+            thread.append((ids, message_list[positions[ids[-1]]][1]))
+            stack.extend(
+                ids + (child_id,) for child_id in reversed(children.get(ids[-1], []))
+            )
+
+        yield thread
+
+
+def get_message_author(message: EmailMessage):
+    # Pipermail obfuscates addresses as "user at example.com", which the header parser of the
+    # default policy mangles, so the raw header is used.
+    from_ = next(
+        (value for key, value in message.raw_items() if key.lower() == "from"), ""
+    )
+    name, addr = parseaddr(_obfuscated_addr_regex.sub(r"\1@\2", from_))
+    return str(make_header(decode_header(name))) if name else addr
+
+
+def get_message_time(message: EmailMessage):
+    try:
+        return parsedate_to_datetime(str(message.get("Date", "")))
+    except (TypeError, ValueError):
+        return None
+
+
+def get_message_text(message: EmailMessage):
+    body = message.get_body(preferencelist=("plain", "html"))
+
+    if not isinstance(body, EmailMessage):
+        return ""
+
+    try:
+        return str(body.get_content())
+    except (LookupError, UnicodeError):
+        payload = body.get_payload(decode=True)
+        return (
+            payload.decode("utf-8", errors="replace")
+            if isinstance(payload, bytes)
+            else ""
+        )
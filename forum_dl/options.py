@@ -37,6 +37,14 @@ def build_parser():
         action="store_true",
         help="List all supported output formats and exit",
     )
+    general.add_argument(
+        "-j",
+        "--jobs",
+        metavar="N",
+        dest="jobs",
+        default="1",
+        help="Number of URLs to download in parallel. With more than one job, OUTFILE is a directory receiving one output per URL (default: 1)",
+    )
 
     session = parser.add_argument_group("Session Options")
     session.add_argument(
@@ -51,7 +59,7 @@ def build_parser():
         metavar="SECONDS",
         dest="time_sleep",
         default="5",
-        help="time to sleep between request to avoid rate limit",
+        help="Minimum time between two requests to the same host, in seconds (default: 5)",
     )
     session.add_argument(
         "-R",
@@ -75,6 +83,48 @@ def build_parser():
         default="2",
         help="A constant by which sleep time is multiplied on each retry (default: 2)",
     )
+    session.add_argument(
+        "--concurrency",
+        metavar="N",
+        dest="concurrency",
+        default="1",
+        help="Maximum number of HTTP requests in flight at once, for extractors that fetch in batches (default: 1)",
+    )
+    session.add_argument(
+        "--http-cache",
+        metavar="DIR",
+        dest="http_cache",
+        default="",
+        help="Keep downloaded pages in DIR and revalidate them with conditional requests on later runs",
+    )
+    session.add_argument(
+        "--memory-cache-size",
+        metavar="MB",
+        dest="memory_cache_size",
+        default="256",
+        help="Maximum total size of responses kept in memory for reuse, in megabytes (default: 256)",
+    )
+    session.add_argument(
+        "--visited-error-rate",
+        metavar="P",
+        dest="visited_error_rate",
+        default="0",
+        help="Track visited URLs in a Bloom filter with false positive rate P instead of an exact set, to save memory (default: 0, exact set)",
+    )
+    session.add_argument(
+        "--visited-capacity",
+        metavar="N",
+        dest="visited_capacity",
+        default="10000000",
+        help="Number of URLs the Bloom filter enabled by --visited-error-rate is sized for (default: 10000000)",
+    )
+    session.add_argument(
+        "--pool-size",
+        metavar="N",
+        dest="pool_size",
+        default="10",
+        help="Maximum number of keep-alive connections kept open per host (default: 10)",
+    )
     session.add_argument(
         "--user-agent",
         metavar="UA",
@@ -83,6 +133,49 @@ def build_parser():
         help="User-Agent request header",
     )
 
+    extractor = parser.add_argument_group("Extractor Options")
+    extractor.add_argument(
+        "--shard",
+        metavar="K/N",
+        dest="shard",
+        default="1/1",
+        help="Download only the K-th of N disjoint parts of a site, for extractors that support it (Hacker News). Outputs of all parts can be combined with --merge (default: 1/1)",
+    )
+    extractor.add_argument(
+        "--batch-size",
+        metavar="N",
+        dest="batch_size",
+        default="20",
+        help="Number of posts requested at once, for extractors that fetch posts in batches (Discourse) (default: 20)",
+    )
+    extractor.add_argument(
+        "--latest",
+        dest="latest",
+        action="store_true",
+        help="Walk the site-wide list of recently active threads instead of each board, for extractors that support it (Discourse). Combined with --incremental, stops at threads that have not changed since the previous run",
+    )
+    extractor.add_argument(
+        "--bulk",
+        dest="bulk",
+        action="store_true",
+        help="Download whole monthly archives instead of individual messages, for extractors that support it (Pipermail, Hyperkitty). Threads are rebuilt from message headers, so their ids may differ from normal mode",
+    )
+    extractor.add_argument(
+        "--detection-cache",
+        metavar="FILE",
+        dest="detection_cache",
+        default="",
+        help="Remember in FILE which extractor and base URL were detected for each site, to skip detection on later runs",
+    )
+    extractor.add_argument(
+        "--parser",
+        metavar="NAME",
+        dest="parser",
+        choices=["bs4", "lxml"],
+        default="bs4",
+        help="HTML parser, either bs4 or the faster lxml, for the extractors of HTML forums (phpBB, Simple Machines, XenForo, vBulletin, Invision, ProBoards). Post contents may be serialized slightly differently (default: bs4)",
+    )
+
     output = parser.add_argument_group("Output Options")
     output.add_argument(
         "-q",
@@ -191,6 +284,38 @@ def build_parser():
         action="store_true",
         help="Append author and domain as an addr-spec in the From header",
     )
+    output.add_argument(
+        "--incremental",
+        dest="incremental",
+        action="store_true",
+        help="Append only content not present in OUTFILE yet, using the metadata stored by previous incremental runs",
+    )
+    output.add_argument(
+        "--resume",
+        dest="resume",
+        action="store_true",
+        help="Resume an interrupted download from the checkpoint stored next to OUTFILE (JSONL output files only)",
+    )
+    output.add_argument(
+        "--checkpoint-interval",
+        metavar="SECONDS",
+        dest="checkpoint_interval",
+        default="60",
+        help="Minimum time between two checkpoints, 0 to disable them (default: 60)",
+    )
+    output.add_argument(
+        "--write-queue-size",
+        metavar="N",
+        dest="write_queue_size",
+        default="100",
+        help="Number of items that can wait to be written by the background writer thread, 0 to write on the fetching thread (default: 100)",
+    )
+    output.add_argument(
+        "--merge",
+        dest="merge",
+        action="store_true",
+        help="Merge the JSONL outputs of --shard downloads, given instead of URLs, into OUTFILE and exit",
+    )
 
     parser.add_argument(
         "urls",
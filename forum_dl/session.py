@@ -4,6 +4,10 @@ from typing import *  # type: ignore
 
 from pydantic import BaseModel
 from functools import lru_cache, wraps
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, Future
+from collections import deque
+from urllib.parse import urlparse
 from tenacity import (
     retry,
     wait_random_exponential,
@@ -12,12 +16,22 @@ from tenacity import (
 )
 import time
 import logging
+import threading
 
+from .cache import ResponseCache, DiskCache
+from .visited import VisitedSet, FingerprintSet, BloomFilter, fingerprint
 from .exceptions import AlreadyVisitedError, AlreadyFailedError
 from .version import __version__
 
 if TYPE_CHECKING:
     from requests import Response
+    import requests
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# `capture_http` patches `http.client` globally, so requests being recorded must not overlap.
+_warc_lock = threading.Lock()
 
 
 class SessionOptions(BaseModel):
@@ -28,43 +42,129 @@ class SessionOptions(BaseModel):
     warc_output: str
     user_agent: str
     get_urls: bool
-    time_sleep: int
+    time_sleep: float = 0
+    concurrency: int = 1
+    http_cache: str = ""
+    memory_cache_size: float = 256
+    visited_error_rate: float = 0
+    visited_capacity: int = 10_000_000
+    pool_size: int = 10
+
+
+class HostScheduler:
+    def __init__(self, interval: float):
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._next_times: dict[str, float] = {}
+
+    def wait(self, url: str):
+        if self._interval <= 0:
+            return
+
+        host = urlparse(url).netloc
+
+        # Reserve the next slot for this host, then sleep outside the lock so that requests to
+        # other hosts can proceed in the meantime.
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_times.get(host, now))
+            self._next_times[host] = start + self._interval
+
+        if start > now:
+            time.sleep(start - now)
+
+
+class WarcRecorder:
+    def __init__(self, path: str):
+        from warcio.warcwriter import WARCWriter
+        from warcio.capture_http import capture_http
+
+        self._capture_http = capture_http
+        self._file = open(path, "wb")
+        self._writer = WARCWriter(self._file)
+
+    @contextmanager
+    def record(self):
+        with _warc_lock, self._capture_http(self._writer):
+            yield
+
+    def close(self):
+        self._file.close()
+
+
+def _make_http_session(options: SessionOptions):
+    # For the `warcio` recording to work, `requests` must be imported only after `capture_http`.
+    import requests
+
+    http_session = requests.Session()
+
+    adapter = requests.adapters.HTTPAdapter(
+        pool_maxsize=max(options.pool_size, options.concurrency)
+    )
+    http_session.mount("http://", adapter)
+    http_session.mount("https://", adapter)
+
+    return http_session
+
+
+def _make_response_cache(
+    options: SessionOptions,
+) -> ResponseCache[tuple[str, frozenset[tuple[str, Any]], frozenset[tuple[str, Any]]]]:
+    return ResponseCache(int(options.memory_cache_size * 1024 * 1024))
 
 
 class Session:
-    def __init__(self, options: SessionOptions):
-        self._warc_file = None
+    def __init__(
+        self,
+        options: SessionOptions,
+        *,
+        scheduler: HostScheduler | None = None,
+        warc_recorder: WarcRecorder | None = None,
+        disk_cache: DiskCache | None = None,
+        http_session: requests.Session | None = None,
+        cache: ResponseCache | None = None,
+    ):
+        # Resources not shared with other sessions are closed together with this one.
+        self._owned_resources: list[WarcRecorder | DiskCache | requests.Session] = []
 
-        if options.warc_output:
-            from warcio.warcwriter import WARCWriter
-            from warcio.capture_http import capture_http
+        if not warc_recorder and options.warc_output:
+            warc_recorder = WarcRecorder(options.warc_output)
+            self._owned_resources.append(warc_recorder)
 
-            self._capture_http = capture_http
-            self._warc_file = open(options.warc_output, "wb")
-            self._warc_writer = WARCWriter(self._warc_file)
+        if not disk_cache and options.http_cache:
+            disk_cache = DiskCache(options.http_cache)
+            self._owned_resources.append(disk_cache)
 
-        # For the `warcio` recording to work, `requests` must be imported only after `capture_http`.
-        import requests
+        if not http_session:
+            http_session = _make_http_session(options)
+            self._owned_resources.append(http_session)
 
-        self._session = requests.Session()
+        self._session = http_session
         self._options = options
-        self._cache: dict[
-            tuple[str, frozenset[tuple[str, Any]], frozenset[tuple[str, Any]]],
-            requests.Response,
-        ] = {}
-        self._past_requests: set[
-            tuple[str, frozenset[tuple[str, Any]], frozenset[tuple[str, Any]]]
-        ] = set()
-        self._past_failed_requests: set[
-            tuple[str, frozenset[tuple[str, Any]], frozenset[tuple[str, Any]]]
-        ] = set()
+        self._scheduler = scheduler or HostScheduler(options.time_sleep)
+        self._warc_recorder = warc_recorder
+        self._disk_cache = disk_cache
+        self._cache = cache if cache is not None else _make_response_cache(options)
+        self._past_requests: VisitedSet = (
+            BloomFilter(options.visited_capacity, options.visited_error_rate)
+            if options.visited_error_rate
+            else FingerprintSet()
+        )
+        self._past_failed_requests = FingerprintSet()
 
         self.delay = 1
         self.attempts = 0
 
     def __del__(self):
-        if self._warc_file:
-            self._warc_file.close()
+        self.close()
+
+    def close(self):
+        while self._owned_resources:
+            self._owned_resources.pop().close()
+
+    @property
+    def cache(self):
+        return self._cache
 
     def get(
         self,
@@ -74,6 +174,7 @@ class Session:
         headers: dict[str, Any] = {},
         should_cache: bool = False,
         should_retry: bool = True,
+        should_mark_visited: bool = True,
         **kwargs: Any,
     ):
         response = self.try_get(
@@ -82,14 +183,61 @@ class Session:
             headers=headers,
             should_cache=should_cache,
             should_retry=should_retry,
+            should_mark_visited=should_mark_visited,
             **kwargs,
         )
 
-        time.sleep(self._options.time_sleep)
         response.raise_for_status()
 
         return response
 
+    def get_many(
+        self,
+        urls: Iterable[str],
+        *,
+        params: dict[str, Any] = {},
+        headers: dict[str, Any] = {},
+        should_cache: bool = False,
+        should_retry: bool = True,
+        should_mark_visited: bool = True,
+        **kwargs: Any,
+    ):
+        return self.map(
+            lambda url: self.get(
+                url,
+                params=params,
+                headers=headers,
+                should_cache=should_cache,
+                should_retry=should_retry,
+                should_mark_visited=should_mark_visited,
+                **kwargs,
+            ),
+            urls,
+        )
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> Generator[R, None, None]:
+        # Results are yielded in the order of `items`, with at most `concurrency` calls in flight.
+        if self._options.concurrency <= 1:
+            for item in items:
+                yield fn(item)
+
+            return
+
+        executor = ThreadPoolExecutor(max_workers=self._options.concurrency)
+        futures: deque[Future[R]] = deque()
+
+        try:
+            for item in items:
+                futures.append(executor.submit(fn, item))
+
+                if len(futures) >= self._options.concurrency:
+                    yield futures.popleft().result()
+
+            while futures:
+                yield futures.popleft().result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def try_get(
         self,
         url: str,
@@ -98,23 +246,28 @@ class Session:
         headers: dict[str, Any] = {},
         should_cache: bool = False,
         should_retry: bool = True,
+        should_mark_visited: bool = True,
         **kwargs: Any,
     ) -> Response:
         logging.debug(f"Attempting GET {url} {params} {headers}")
 
         frozen_params = frozenset(params.items())
         frozen_headers = frozenset(headers.items())
+        fp = fingerprint(url, params, headers)
 
-        if (url, frozen_params, frozen_headers) in self._cache:
-            cached_response = self._cache[(url, frozen_params, frozen_headers)]
+        # Requests that are never cached would only inflate the misses.
+        cached_response = self._cache.get(
+            (url, frozen_params, frozen_headers), should_count_miss=should_cache
+        )
 
+        if cached_response is not None:
             if not should_cache:
-                del self._cache[(url, frozen_params, frozen_headers)]
+                self._cache.pop((url, frozen_params, frozen_headers))
 
             return cached_response
-        elif (url, frozen_params, frozen_headers) in self._past_requests:
+        elif fp in self._past_requests:
             raise AlreadyVisitedError(url, frozen_params, frozen_headers)
-        elif (url, frozen_params, frozen_headers) in self._past_failed_requests:
+        elif fp in self._past_failed_requests:
             raise AlreadyFailedError(url, frozen_params, frozen_headers)
 
         if should_retry:
@@ -140,15 +293,15 @@ class Session:
             try:
                 response = retrying_get(url, params=params, headers=headers, **kwargs)
             except:
-                self._past_failed_requests.add((url, frozen_params, frozen_headers))
+                self._past_failed_requests.add(fp)
                 raise
         else:
             response = self._do_get(url, params=params, headers=headers, **kwargs)
 
         if should_cache:
-            self._cache[(url, frozen_params, frozen_headers)] = response
-        else:
-            self._past_requests.add((url, frozen_params, frozen_headers))
+            self._cache.put((url, frozen_params, frozen_headers), response)
+        elif should_mark_visited:
+            self._past_requests.add(fp)
 
         return response
 
@@ -168,11 +321,40 @@ class Session:
         else:
             logging.info(f"GET {url} {params} {headers}")
 
-        if not headers:
-            headers = {"User-Agent": self._options.user_agent}
+        entry = None
 
-        if self._warc_file:
-            with self._capture_http(self._warc_writer):
+        if self._disk_cache:
+            entry = self._disk_cache.load(url, params, headers)
+
+        request_headers = headers or {"User-Agent": self._options.user_agent}
+
+        # When recording WARC, always download full responses so that the archive is complete.
+        if entry and not self._warc_recorder:
+            request_headers = {**request_headers, **entry.validators}
+
+        self._scheduler.wait(url)
+        response = self._send(url, params=params, headers=request_headers, **kwargs)
+
+        if self._disk_cache:
+            if entry and response.status_code == 304:
+                logging.debug(f"Not modified: {url}")
+                return entry.build_response(response)
+
+            if response.status_code == 200:
+                self._disk_cache.store(url, params, headers, response)
+
+        return response
+
+    def _send(
+        self,
+        url: str,
+        *,
+        params: dict[str, Any],
+        headers: dict[str, Any],
+        **kwargs: Any,
+    ) -> Response:
+        if self._warc_recorder:
+            with self._warc_recorder.record():
                 return self._session.get(
                     url,
                     params=params,
@@ -189,6 +371,16 @@ class Session:
                 **kwargs,
             )
 
+    @property
+    def visited_count(self):
+        return len(self._past_requests)
+
+    def dump_visited(self):
+        return self._past_requests.serialize()
+
+    def merge_visited(self, data: bytes):
+        self._past_requests.merge(data)
+
     def validate_url(self, url: str):
         try:
             self._session.get_adapter(url)
@@ -196,3 +388,54 @@ class Session:
             return False
 
         return True
+
+
+class SessionPool:
+    def __init__(self, options: SessionOptions):
+        self._options = options
+        self._lock = threading.Lock()
+        self._hosts: dict[str, tuple[requests.Session, ResponseCache]] = {}
+
+        # Shared by all sessions, so that politeness holds across hosts aliased by redirects and
+        # everything ends up in a single WARC file and HTTP cache.
+        self._scheduler = HostScheduler(options.time_sleep)
+        self._warc_recorder = (
+            WarcRecorder(options.warc_output) if options.warc_output else None
+        )
+        self._disk_cache = DiskCache(options.http_cache) if options.http_cache else None
+
+    def get(self, url: str):
+        host = urlparse(url).netloc
+
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = (
+                    _make_http_session(self._options),
+                    _make_response_cache(self._options),
+                )
+
+            http_session, cache = self._hosts[host]
+
+        # Connections and cached responses are shared per host, but each URL gets its own visited
+        # and failed requests, so that it isn't cut short by pages already visited for another URL.
+        return Session(
+            self._options,
+            scheduler=self._scheduler,
+            warc_recorder=self._warc_recorder,
+            disk_cache=self._disk_cache,
+            http_session=http_session,
+            cache=cache,
+        )
+
+    def close(self):
+        for host, (http_session, cache) in self._hosts.items():
+            logging.debug(f"Response cache of {host}: {cache}")
+            http_session.close()
+
+        self._hosts.clear()
+
+        if self._warc_recorder:
+            self._warc_recorder.close()
+
+        if self._disk_cache:
+            self._disk_cache.close()
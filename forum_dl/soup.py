@@ -2,16 +2,24 @@
 from __future__ import annotations
 from typing import *  # type: ignore
 from re import Pattern
+from functools import lru_cache
+from itertools import chain
 
 from .exceptions import TagSearchError, AttributeSearchError, PropertyError
+from cssselect import HTMLTranslator
+from bs4 import SoupStrainer
 import bs4
+import lxml.etree
+import lxml.html
 
 SoupInput = Callable[[Any], bool] | Pattern[str] | set[str] | str | bool | None
 
 
 class Soup:
-    def __init__(self, markup: str | bytes):
-        self.soup = bs4.BeautifulSoup(markup, "lxml")
+    def __init__(self, markup: str | bytes, only: SoupStrainer | None = None):
+        # With `only`, just the matching elements are kept, and the rest of the document is
+        # skipped while parsing.
+        self.soup = bs4.BeautifulSoup(markup, "lxml", parse_only=only)
 
     def try_find(
         self,
@@ -57,11 +65,21 @@ class Soup:
 
         return [SoupTag(tag) for tag in result]
 
+    def select(self, css: str):
+        return [SoupTag(tag) for tag in self.soup.select(css)]
+
+    def select_one(self, css: str):
+        if (result := self.soup.select_one(css)) is not None:
+            return SoupTag(result)
+
 
 class SoupTag:
     def __init__(self, tag: bs4.element.Tag):
         self.tag = tag
 
+    def __str__(self):
+        return str(self.tag)
+
     def try_find(
         self,
         name: SoupInput | None = None,
@@ -106,6 +124,13 @@ class SoupTag:
 
         return [SoupTag(tag) for tag in result]
 
+    def select(self, css: str):
+        return [SoupTag(tag) for tag in self.tag.select(css)]
+
+    def select_one(self, css: str):
+        if (result := self.tag.select_one(css)) is not None:
+            return SoupTag(result)
+
     def find_next(
         self,
         name: SoupInput | None = None,
@@ -134,6 +159,18 @@ class SoupTag:
 
         return SoupTag(result)
 
+    def try_find_previous_sibling(
+        self,
+        name: SoupInput | None = None,
+        attrs: dict[str, Any] = {},
+        string: SoupInput | None = None,
+        **kwargs: Any,
+    ):
+        result = self.tag.find_previous_sibling(name, attrs, string, **kwargs)
+
+        if isinstance(result, bs4.element.Tag):
+            return SoupTag(result)
+
     def try_get(self, key: str, default: str | list[str] | None = None):
         return self.tag.get(key, default)
 
@@ -157,10 +194,18 @@ class SoupTag:
         # TODO: Error handling?
         return self.tag.encode_contents()
 
+    @property
+    def name(self):
+        return self.tag.name
+
     @property
     def string(self):
         return "".join(str(v) for v in self.tag.contents)
 
+    @property
+    def text(self):
+        return self.tag.get_text()
+
     @property
     def contents(self):
         if not self.tag.contents:
@@ -179,7 +224,7 @@ class SoupTag:
 
     @property
     def parents(self):
-        return self.tag.parents
+        return (SoupTag(parent) for parent in self.tag.parents)
 
     @property
     def next_sibling(self):
@@ -202,3 +247,400 @@ class SoupTag:
     @property
     def previous_siblings(self):
         return self.tag.previous_siblings
+
+
+# Attributes that `bs4` splits into lists of values, which the `lxml` backend mimics.
+_multi_valued_attributes = {
+    "class",
+    "rel",
+    "rev",
+    "accept-charset",
+    "headers",
+    "accesskey",
+    "dropzone",
+}
+
+
+@lru_cache(maxsize=None)
+def _compile_css(css: str, prefix: str):
+    # `soupsieve` spells `:contains()` with a vendor prefix.
+    css = css.replace(":-soup-contains(", ":contains(")
+    return lxml.etree.XPath(HTMLTranslator().css_to_xpath(css, prefix=prefix))
+
+
+def _is_element(node: Any) -> TypeGuard[lxml.html.HtmlElement]:
+    # Comments and processing instructions have functions as their tags.
+    return isinstance(node, lxml.html.HtmlElement) and isinstance(node.tag, str)
+
+
+def _match_value(value: str | list[str] | None, matcher: Any) -> bool:
+    if matcher is True:
+        return value is not None
+
+    if matcher is None:
+        return value is None
+
+    if value is None:
+        return False
+
+    if isinstance(value, list):
+        # Like `bs4`, a multi-valued attribute matches if any of its values or all of them
+        # together do.
+        return any(_match_value(v, matcher) for v in value + [" ".join(value)])
+
+    if isinstance(matcher, Pattern):
+        return bool(cast(Pattern[str], matcher).search(value))
+
+    if isinstance(matcher, (set, list)):
+        return value in matcher
+
+    if callable(matcher):
+        return bool(matcher(value))
+
+    return value == matcher
+
+
+def _find_all(
+    elements: Iterable[Any],
+    name: SoupInput | None,
+    attrs: dict[str, Any],
+    string: SoupInput | None,
+    limit: int | None,
+    kwargs: dict[str, Any],
+):
+    attrs = dict(attrs)
+
+    for key, value in kwargs.items():
+        attrs["class" if key == "class_" else key] = value
+
+    result: list[SoupTag] = []
+
+    for element in elements:
+        if not _is_element(element):
+            continue
+
+        tag = LxmlSoupTag(element)
+
+        if name not in (None, True) and not (
+            name(tag) if callable(name) else _match_value(tag.name, name)
+        ):
+            continue
+
+        if not all(_match_value(tag.try_get(k), v) for k, v in attrs.items()):
+            continue
+
+        # Like `bs4`, a string only matches elements that hold nothing but text.
+        if string is not None and (
+            len(element) or not _match_value(element.text or "", string)
+        ):
+            continue
+
+        result.append(tag)
+
+        if limit and len(result) >= limit:
+            break
+
+    return result
+
+
+def _parse_html(markup: str | bytes):
+    if isinstance(markup, bytes):
+        # `libxml2` falls back to Latin-1 on pages that don't declare their encoding, so the
+        # encoding is detected the same way `bs4` does.
+        encoding = bs4.UnicodeDammit(markup, is_html=True).original_encoding
+        parser = lxml.html.HTMLParser(encoding=encoding)
+    else:
+        parser = lxml.html.HTMLParser()
+
+    try:
+        return lxml.html.document_fromstring(markup, parser=parser)
+    except lxml.etree.ParserError:
+        return lxml.html.document_fromstring("<html></html>")
+
+
+class LxmlSoup(Soup):
+    # Same interface as `Soup`, but on `lxml`'s own tree, which is much faster to build and
+    # search than the one of `bs4`.
+    def __init__(self, markup: str | bytes, only: SoupStrainer | None = None):
+        # `lxml` can't skip parts of documents, but its trees are cheap enough without that.
+        self.root = _parse_html(markup)
+
+    def try_find(
+        self,
+        name: SoupInput | None = None,
+        attrs: dict[str, Any] = {},
+        recursive: bool = True,
+        string: SoupInput | None = None,
+        **kwargs: Any,
+    ) -> SoupTag | None:
+        result = self.find_all(name, attrs, recursive, string, 1, **kwargs)
+
+        if result:
+            return result[0]
+
+    def find(
+        self,
+        name: SoupInput | None = None,
+        attrs: dict[str, Any] = {},
+        recursive: bool = True,
+        string: SoupInput | None = None,
+        **kwargs: Any,
+    ) -> SoupTag:
+        result = self.try_find(name, attrs, recursive, string, **kwargs)
+
+        if not result:
+            raise TagSearchError(self.root, name, attrs, recursive, string, kwargs)
+
+        return result
+
+    def find_all(
+        self,
+        name: SoupInput | None = None,
+        attrs: dict[str, Any] = {},
+        recursive: bool = True,
+        string: SoupInput | None = None,
+        limit: int | None = None,
+        **kwargs: Any,
+    ) -> list[SoupTag]:
+        elements = self.root.iter() if recursive else [self.root]
+        return _find_all(elements, name, attrs, string, limit, kwargs)
+
+    def select(self, css: str) -> list[SoupTag]:
+        elements = _compile_css(css, "descendant-or-self::")(self.root)
+        return [LxmlSoupTag(element) for element in cast(list[Any], elements)]
+
+    def select_one(self, css: str) -> SoupTag | None:
+        if result := self.select(css):
+            return result[0]
+
+
+class LxmlSoupTag(SoupTag):
+    def __init__(self, element: lxml.html.HtmlElement):
+        self.element = element
+
+    def __str__(self):
+        return lxml.html.tostring(self.element, encoding="unicode", with_tail=False)
+
+    def try_find(
+        self,
+        name: SoupInput | None = None,
+        attrs: dict[str, Any] = {},
+        recursive: bool = True,
+        string: SoupInput | None = None,
+        **kwargs: Any,
+    ) -> SoupTag | None:
+        result = self.find_all(name, attrs, recursive, string, 1, **kwargs)
+
+        if result:
+            return result[0]
+
+    def find(
+        self,
+        name: SoupInput | None = None,
+        attrs: dict[str, Any] = {},
+        recursive: bool = True,
+        string: SoupInput | None = None,
+        **kwargs: Any,
+    ):
+        result = self.try_find(name, attrs, recursive, string, **kwargs)
+
+        if not result:
+            raise TagSearchError(self.element, name, attrs, recursive, string, kwargs)
+
+        return result
+
+    def find_all(
+        self,
+        name: SoupInput | None = None,
+        attrs: dict[str, Any] = {},
+        recursive: bool = True,
+        string: SoupInput | None = None,
+        limit: int | None = None,
+        **kwargs: Any,
+    ) -> list[SoupTag]:
+        elements = self.element.iterdescendants() if recursive else self.element
+        return _find_all(elements, name, attrs, string, limit, kwargs)
+
+    def select(self, css: str) -> list[SoupTag]:
+        elements = _compile_css(css, "descendant::")(self.element)
+        return [LxmlSoupTag(element) for element in cast(list[Any], elements)]
+
+    def select_one(self, css: str) -> SoupTag | None:
+        if result := self.select(css):
+            return result[0]
+
+    def find_next(
+        self,
+        name: SoupInput | None = None,
+        attrs: dict[str, Any] = {},
+        string: SoupInput | None = None,
+        **kwargs: Any,
+    ):
+        elements = chain(
+            self.element.iterdescendants(),
+            cast(list[Any], self.element.xpath("following::*")),
+        )
+        result = _find_all(elements, name, attrs, string, 1, kwargs)
+
+        if not result:
+            raise TagSearchError(self.element, name, attrs, string, kwargs)
+
+        return result[0]
+
+    def find_previous(
+        self,
+        name: SoupInput | None = None,
+        attrs: dict[str, Any] = {},
+        string: SoupInput | None = None,
+        **kwargs: Any,
+    ):
+        elements = reversed(
+            cast(list[Any], self.element.xpath("preceding::* | ancestor::*"))
+        )
+        result = _find_all(elements, name, attrs, string, 1, kwargs)
+
+        if not result:
+            raise TagSearchError(self.element, name, attrs, string, kwargs)
+
+        return result[0]
+
+    def try_find_previous_sibling(
+        self,
+        name: SoupInput | None = None,
+        attrs: dict[str, Any] = {},
+        string: SoupInput | None = None,
+        **kwargs: Any,
+    ):
+        elements = self.element.itersiblings(preceding=True)
+        result = _find_all(elements, name, attrs, string, 1, kwargs)
+
+        if result:
+            return result[0]
+
+    def try_get(self, key: str, default: str | list[str] | None = None):
+        value = self.element.get(key)
+
+        if value is None:
+            return default
+
+        if key in _multi_valued_attributes:
+            return value.split()
+
+        return value
+
+    def get(self, key: str, default: str | list[str] | None = None):
+        result = self.try_get(key, default)
+
+        if not isinstance(result, str):
+            raise AttributeSearchError(self.element, key)
+
+        return result
+
+    def get_list(self, key: str, default: str | list[str] | None = None) -> list[str]:
+        result = self.try_get(key, default)
+
+        if not isinstance(result, list):
+            raise AttributeSearchError(self.element, key)
+
+        return result
+
+    def encode_contents(self):
+        return self.string.encode("utf-8")
+
+    @property
+    def name(self):
+        return str(self.element.tag)
+
+    @property
+    def string(self):
+        return "".join(str(v) for v in self._nodes())
+
+    @property
+    def text(self):
+        return str(self.element.text_content())
+
+    @property
+    def contents(self):
+        contents = list(self._nodes())
+
+        if not contents:
+            raise PropertyError(self.element, "contents")
+
+        return contents
+
+    @property
+    def tags(self) -> list[SoupTag]:
+        tags = [LxmlSoupTag(e) for e in self.element if _is_element(e)]
+
+        if not tags:
+            raise PropertyError
+
+        return tags
+
+    @property
+    def parents(self):
+        return (LxmlSoupTag(parent) for parent in self.element.iterancestors())
+
+    @property
+    def next_sibling(self):
+        # Text between elements is the tail of the previous one in `lxml`.
+        next_element = self.element.getnext()
+
+        if self.element.tail or not _is_element(next_element):
+            raise ValueError
+
+        return LxmlSoupTag(next_element)
+
+    @property
+    def next_siblings(self):
+        return self._siblings(self.element, False)
+
+    @property
+    def previous_sibling(self):
+        previous_element = self.element.getprevious()
+
+        if previous_element is None or previous_element.tail:
+            raise ValueError
+
+        if not _is_element(previous_element):
+            raise ValueError
+
+        return LxmlSoupTag(previous_element)
+
+    @property
+    def previous_siblings(self):
+        return self._siblings(self.element, True)
+
+    def _nodes(self) -> Generator[str | LxmlSoupTag, None, None]:
+        # Text is left unescaped, like the strings of `bs4`.
+        if self.element.text:
+            yield self.element.text
+
+        for child in self.element:
+            if _is_element(child):
+                yield LxmlSoupTag(child)
+            else:
+                yield lxml.html.tostring(child, encoding="unicode", with_tail=False)
+
+            if child.tail:
+                yield child.tail
+
+    @staticmethod
+    def _siblings(
+        element: lxml.html.HtmlElement, preceding: bool
+    ) -> Generator[str | LxmlSoupTag, None, None]:
+        if not preceding and element.tail:
+            yield element.tail
+
+        for sibling in element.itersiblings(preceding=preceding):
+            if preceding and sibling.tail:
+                yield sibling.tail
+
+            if _is_element(sibling):
+                yield LxmlSoupTag(sibling)
+
+            if not preceding and sibling.tail:
+                yield sibling.tail
+
+        if preceding and (parent := element.getparent()) is not None and parent.text:
+            yield parent.text
@@ -0,0 +1,87 @@
+# pyright: strict
+from __future__ import annotations
+from typing import *  # type: ignore
+
+from ..session import Session, SessionOptions
+
+from urllib.parse import urlencode
+import json
+import threading
+import time
+
+
+def make_session_options(**kwargs: Any):
+    return SessionOptions(
+        **{
+            "timeout": 1,
+            "retries": 1,
+            "retry_sleep": 0,
+            "retry_sleep_multiplier": 1,
+            "warc_output": "",
+            "user_agent": "",
+            "get_urls": False,
+            **kwargs,
+        }
+    )
+
+
+class FakeResponse:
+    def __init__(self, url: str, content: bytes):
+        self.url = url
+        self.content = content
+        self.status_code = 200
+        self.headers: dict[str, str] = {}
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession(Session):
+    # Serves `pages` by URL, params included in the query string. Missing pages raise `KeyError`.
+    def __init__(
+        self,
+        pages: Mapping[str, str | bytes] | Callable[[str], str | bytes],
+        *,
+        delays: Mapping[str, float] = {},
+        **kwargs: Any,
+    ):
+        super().__init__(make_session_options(**kwargs))
+        self.pages = pages
+        self.delays = delays
+        self.fetched_urls: list[str] = []
+        self.completed_urls: list[str] = []
+        self.max_in_flight = 0
+
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _do_get(self, url: str, *, params: dict[str, Any] = {}, **kwargs: Any):
+        if params:
+            url = f"{url}?{urlencode(params, doseq=True)}"
+
+        with self._lock:
+            self.fetched_urls.append(url)
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+
+        try:
+            time.sleep(self.delays.get(url, 0))
+            content = self.pages(url) if callable(self.pages) else self.pages[url]
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        with self._lock:
+            self.completed_urls.append(url)
+
+        if isinstance(content, str):
+            content = content.encode()
+
+        return cast(Any, FakeResponse(url, content))
@@ -0,0 +1,201 @@
+# pyright: strict
+from __future__ import annotations
+from typing import *  # type: ignore
+
+from ..extractors.common import ExtractorOptions, Thread, Post
+from ..extractors.discourse import DiscourseExtractor, DiscourseThreadPageState
+from ..writers.common import WriterOptions
+from ..writers.jsonl import JsonlWriter
+from .common import FakeSession
+
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+import json
+
+BASE_URL = "https://forum.example.com/"
+
+
+def make_post_data(post_id: int):
+    return {
+        "id": post_id,
+        "topic_slug": "topic",
+        "topic_id": post_id // 100,
+        "post_number": post_id % 100,
+        "username": "jdoe",
+        "created_at": f"2020-01-01T00:{post_id % 100:02}:00Z",
+        "cooked": f"<p>{post_id}</p>",
+    }
+
+
+def make_topic_page(topic_id: int, post_ids: list[int], stream: list[int]):
+    return json.dumps(
+        {
+            "id": topic_id,
+            "post_stream": {
+                "posts": [make_post_data(post_id) for post_id in post_ids],
+                "stream": stream,
+            },
+        }
+    )
+
+
+def get_posts_page(url: str):
+    post_ids = parse_qs(urlparse(url).query)["post_ids[]"]
+    return json.dumps(
+        {"post_stream": {"posts": [make_post_data(int(id)) for id in post_ids]}}
+    )
+
+
+def get_batch_post_ids(session: FakeSession):
+    return [
+        [int(id) for id in parse_qs(urlparse(url).query)["post_ids[]"]]
+        for url in session.fetched_urls
+        if "/posts.json" in url
+    ]
+
+
+def make_thread(topic_id: int):
+    return Thread(
+        path=("1", str(topic_id)),
+        url=f"{BASE_URL}t/topic/{topic_id}",
+        origin="",
+        data={},
+        title="",
+    )
+
+
+def test_post_batches():
+    # 2 posts come with the topic, and the remaining 8 in batches of 3.
+    stream = list(range(501, 511))
+    pages = {f"{BASE_URL}t/topic/5.json": make_topic_page(5, stream[:2], stream)}
+
+    def get_page(url: str):
+        return pages[url] if url in pages else get_posts_page(url)
+
+    session = FakeSession(get_page, concurrency=2)
+    extractor = DiscourseExtractor(
+        session, BASE_URL, ExtractorOptions(path=False, batch_size=3)
+    )
+    thread = make_thread(5)
+
+    posts: list[Post] = []
+    offsets: list[int] = []
+
+    # The state points at the batch of the latest post, to resume from.
+    for post in extractor.posts(thread):
+        posts.append(post)
+
+        if isinstance(thread_state := extractor.thread_state, DiscourseThreadPageState):
+            offsets.append(thread_state.offset)
+
+    assert [post.subpath for post in posts] == [(str(id),) for id in stream]
+    assert offsets == [0, 0, 0, 3, 3, 3, 6, 6]
+    assert get_batch_post_ids(session) == [
+        [503, 504, 505],
+        [506, 507, 508],
+        [509, 510],
+    ]
+
+    # Resuming from a saved state continues with the batch it points at.
+    state = DiscourseThreadPageState(
+        url=f"{BASE_URL}t/5/posts.json", page=2, stream_data=stream[2:], offset=3
+    )
+    session = FakeSession(get_page, concurrency=2)
+    extractor = DiscourseExtractor(
+        session, BASE_URL, ExtractorOptions(path=False, batch_size=3)
+    )
+
+    posts = list(extractor.posts(thread, state))
+    assert [post.subpath for post in posts] == [(str(id),) for id in stream[5:]]
+    assert get_batch_post_ids(session) == [[506, 507, 508], [509, 510]]
+
+
+def make_latest_page(topics: list[tuple[int, int]], next_page: int | None):
+    topic_list: dict[str, Any] = {
+        "topics": [
+            {
+                "id": topic_id,
+                "slug": "topic",
+                "title": f"Topic {topic_id}",
+                "category_id": 1,
+                "posts_count": post_count,
+                "highest_post_number": post_count,
+            }
+            for topic_id, post_count in topics
+        ]
+    }
+
+    if next_page is not None:
+        topic_list["more_topics_url"] = f"/latest?page={next_page}"
+
+    return json.dumps({"topic_list": topic_list})
+
+
+def test_latest_incremental(tmp_path: Path):
+    output_path = tmp_path / "out.jsonl"
+    site_page = json.dumps(
+        {"categories": [{"id": 1, "slug": "general", "name": "General"}]}
+    )
+
+    def write(pages: dict[str, str]):
+        session = FakeSession(
+            lambda url: pages[url] if url in pages else get_posts_page(url)
+        )
+        extractor = DiscourseExtractor(
+            session, BASE_URL, ExtractorOptions(path=False, latest=True)
+        )
+        extractor.fetch()
+        writer = JsonlWriter(
+            extractor,
+            WriterOptions(
+                output_path=str(output_path),
+                files_output_path="",
+                write_board_objects=False,
+                write_thread_objects=False,
+                write_post_objects=True,
+                write_file_objects=False,
+                write_outside_file_objects=False,
+                textify=False,
+                content_as_title=False,
+                author_as_addr_spec=False,
+                incremental=True,
+            ),
+        )
+
+        try:
+            writer.write(BASE_URL)
+        finally:
+            del writer
+
+        with open(output_path) as f:
+            return session, [json.loads(line)["item"]["subpath"] for line in f]
+
+    session, subpaths = write(
+        {
+            f"{BASE_URL}site.json": site_page,
+            f"{BASE_URL}latest.json": make_latest_page([(5, 2), (6, 1)], 1),
+            f"{BASE_URL}latest.json?page=1": make_latest_page([(7, 1)], None),
+            f"{BASE_URL}t/topic/5.json": make_topic_page(5, [501, 502], [501, 502]),
+            f"{BASE_URL}t/topic/6.json": make_topic_page(6, [601], [601]),
+            f"{BASE_URL}t/topic/7.json": make_topic_page(7, [701], [701]),
+        }
+    )
+    assert subpaths == [["501"], ["502"], ["601"], ["701"]]
+
+    # Topic 5 got a post. Of the posts not sent with the topic, only the new one is requested.
+    # Topic 6 is unchanged, so the page listing it brings nothing new and the crawl stops there,
+    # without looking at topic 7.
+    session, subpaths = write(
+        {
+            f"{BASE_URL}site.json": site_page,
+            f"{BASE_URL}latest.json": make_latest_page([(5, 3)], 1),
+            f"{BASE_URL}latest.json?page=1": make_latest_page([(6, 1)], 2),
+            f"{BASE_URL}latest.json?page=2": make_latest_page([(7, 2)], None),
+            f"{BASE_URL}t/topic/5.json": make_topic_page(5, [501], [501, 502, 503]),
+        }
+    )
+    assert subpaths[4:] == [["503"]]
+    assert get_batch_post_ids(session) == [[503]]
+    assert not any(
+        "/t/topic/6" in url or "/t/topic/7" in url for url in session.fetched_urls
+    )
@@ -0,0 +1,77 @@
+# pyright: strict
+from __future__ import annotations
+from typing import *  # type: ignore
+
+from ..extractors.common import ExtractorOptions
+from ..forumdl import ForumDl
+from ..session import Session
+from ..writers.common import WriterOptions
+from .common import FakeResponse, make_session_options
+
+from pathlib import Path
+from urllib.parse import quote_plus
+import json
+import pytest
+
+FIREBASE_URL = "https://hacker-news.firebaseio.com/v0"
+
+URLS = [
+    "https://news.ycombinator.com/item?id=1",
+    "https://news.ycombinator.com/item?id=3",
+]
+
+PAGES = {
+    f"{FIREBASE_URL}/maxitem.json": "4",
+    f"{FIREBASE_URL}/item/1.json": '{"id": 1, "title": "a", "kids": [2], "time": 0}',
+    f"{FIREBASE_URL}/item/2.json": '{"id": 2, "parent": 1, "time": 0}',
+    f"{FIREBASE_URL}/item/3.json": '{"id": 3, "title": "b", "kids": [4], "time": 0}',
+    f"{FIREBASE_URL}/item/4.json": '{"id": 4, "parent": 3, "time": 0}',
+}
+
+
+@pytest.fixture(autouse=True)
+def fake_transport(monkeypatch: pytest.MonkeyPatch):
+    def send(self: Session, url: str, **kwargs: Any):
+        return FakeResponse(url, PAGES[url].encode())
+
+    monkeypatch.setattr(Session, "_send", send)
+
+
+def make_writer_options(output_path: str):
+    return WriterOptions(
+        output_path=output_path,
+        files_output_path="",
+        write_board_objects=False,
+        write_thread_objects=False,
+        write_post_objects=True,
+        write_file_objects=False,
+        write_outside_file_objects=False,
+        textify=False,
+        content_as_title=False,
+        author_as_addr_spec=False,
+    )
+
+
+def read_subpaths(path: Path):
+    with open(path) as f:
+        return [json.loads(line)["item"]["subpath"] for line in f]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_download_same_host(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, jobs: int):
+    # Both URLs request `maxitem.json`, which must not count as visited for the other one.
+    monkeypatch.chdir(tmp_path)
+    output_path = str(tmp_path / "out") if jobs > 1 else ""
+
+    ForumDl().download(
+        URLS,
+        "jsonl",
+        make_session_options(concurrency=2),
+        ExtractorOptions(path=False),
+        make_writer_options(output_path),
+        jobs=jobs,
+    )
+
+    output_dir = tmp_path / "out" if jobs > 1 else tmp_path
+    assert read_subpaths(output_dir / quote_plus(URLS[0])) == [[], ["2"]]
+    assert read_subpaths(output_dir / quote_plus(URLS[1])) == [[], ["4"]]
@@ -0,0 +1,88 @@
+# pyright: strict
+from __future__ import annotations
+from typing import *  # type: ignore
+
+from ..extractors.common import ExtractorOptions, Thread
+from ..extractors.hackernews import HackernewsExtractor
+from .common import FakeSession
+
+import json
+
+
+def get_item_id(url: str):
+    return int(url.rsplit("/", 1)[-1].removesuffix(".json"))
+
+
+def get_item(url: str):
+    return json.dumps({"id": get_item_id(url)})
+
+
+def get_fetched_ids(session: FakeSession):
+    return [get_item_id(url) for url in session.fetched_urls]
+
+
+class SmallCacheExtractor(HackernewsExtractor):
+    ITEM_CACHE_SIZE = 3
+
+
+def test_item_cache():
+    session = FakeSession(get_item)
+    extractor = SmallCacheExtractor(
+        session, "https://news.ycombinator.com/", ExtractorOptions(path=False)
+    )
+
+    def fetch(item_ids: list[int]):
+        items = extractor._fetch_items(item_ids)  # type: ignore
+        assert [item and item["id"] for item in items] == item_ids
+
+    fetch([1, 2, 3])
+    # Hits mixed with new items in a full cache.
+    fetch([1, 4, 5])
+    assert get_fetched_ids(session) == [1, 2, 3, 4, 5]
+
+    # Items 2 and 3 were evicted, and are requested again despite having been visited.
+    fetch([2, 3, 1])
+    assert get_fetched_ids(session)[5:] == [2, 3]
+
+    # Items are only kept parsed, by the extractor.
+    assert len(session.cache) == 0
+
+
+def test_comment_levels():
+    kids = {1: [2, 5], 2: [3], 3: [4], 5: [6, 7]}
+
+    def get_page(url: str):
+        if url.endswith("/maxitem.json"):
+            return "7"
+
+        item_id = get_item_id(url)
+
+        # Deleted items come as null.
+        if item_id == 7:
+            return "null"
+
+        data = {"id": item_id, "kids": kids.get(item_id, []), "time": 0}
+        data |= {"title": "Story"} if item_id == 1 else {"parent": 1}
+        return json.dumps(data)
+
+    session = FakeSession(get_page)
+    extractor = HackernewsExtractor(
+        session, "https://news.ycombinator.com/", ExtractorOptions(path=False)
+    )
+    extractor.fetch()
+    thread = extractor.node_from_url("https://news.ycombinator.com/item?id=1")
+    assert isinstance(thread, Thread)
+
+    # One level of the tree after the other, each post with the ids of all of its ancestors.
+    posts = list(extractor.posts(thread))
+    assert [post.subpath for post in posts] == [
+        (),
+        ("2",),
+        ("5",),
+        ("2", "3"),
+        ("5", "6"),
+        ("2", "3", "4"),
+    ]
+    # Following `maxitem.json`, the root is fetched once for both the thread and its post.
+    item_ids = [get_item_id(url) for url in session.fetched_urls[1:]]
+    assert item_ids == [1, 2, 5, 3, 6, 7, 4]
@@ -0,0 +1,151 @@
+# pyright: strict
+from __future__ import annotations
+from typing import *  # type: ignore
+
+from ..extractors.common import HtmlExtractor, ExtractorOptions, Board, Thread, Post
+from ..extractors.common import PageState, DetectionCache
+from ..session import Session
+from ..soup import SoupTag
+from ..writers.common import WriterOptions
+from ..writers.jsonl import JsonlWriter
+from .common import FakeSession
+
+from pathlib import Path
+import json
+import pytest
+
+if TYPE_CHECKING:
+    from requests import Response
+
+
+class FakeExtractor(HtmlExtractor):
+    _board_item_css = "div.post"
+    _board_next_page_css = "a.next"
+    _board_page_css = "a.page"
+    _thread_item_css = "div.post"
+    _thread_next_page_css = "a.next"
+    _thread_page_css = "a.page"
+
+    @staticmethod
+    def _detect(
+        session: Session, url: str, options: ExtractorOptions, cache: DetectionCache
+    ):
+        return None
+
+    def _fetch_top_boards(self):
+        pass
+
+    def _do_fetch_subboards(self, board: Board):
+        pass
+
+    def _get_node_from_url(self, url: str):
+        return self.root
+
+    def _fetch_lazy_subboards(self, board: Board):
+        yield from ()
+
+    def _extract_board_page_thread(
+        self, board: Board, state: PageState, response: Response, tag: SoupTag
+    ):
+        return None
+
+    def _extract_thread_page_post(
+        self, thread: Thread, state: PageState, response: Response, tag: SoupTag
+    ):
+        post = Post(
+            path=thread.path,
+            subpath=(tag.string,),
+            url=response.url,
+            origin=response.url,
+            data={},
+            author="",
+            creation_time=None,
+            content=tag.string,
+        )
+
+        return post, tag
+
+
+def make_page(start: int, last_start: int):
+    links = "".join(
+        f'<a class="page" href="?start={i * 10}">{i + 1}</a>' for i in (1, 2)
+    )
+    links += f'<a class="page" href="?start={last_start}">{last_start // 10 + 1}</a>'
+
+    if start < last_start:
+        links += f'<a class="next" href="?start={start + 10}"></a>'
+
+    return f'{links}<div class="post">{start}</div>'
+
+
+@pytest.mark.parametrize("parser", ["bs4", "lxml"])
+def test_page_urls(parser: str):
+    base_url = "https://example.com/"
+    pages = {f"{base_url}?start={i * 10}": make_page(i * 10, 50) for i in range(6)}
+    # Page 3 has no next page link, so only fetching the precomputed URLs gets past it. Page 7
+    # was added after the first page was read, and is found from the next page link of page 6.
+    pages[f"{base_url}?start=20"] = make_page(20, 20)
+    pages[f"{base_url}?start=50"] = make_page(50, 60)
+    pages[f"{base_url}?start=60"] = make_page(60, 60)
+
+    session = FakeSession(pages, concurrency=4)
+    extractor = FakeExtractor(
+        session, base_url, ExtractorOptions(path=False, parser=parser)
+    )
+    thread = Thread(
+        path=("1",), url=f"{base_url}?start=0", origin="", data={}, title=""
+    )
+
+    posts = list(extractor.posts(thread))
+
+    assert [post.subpath for post in posts] == [(str(i * 10),) for i in range(7)]
+    assert sorted(session.fetched_urls) == [
+        f"{base_url}?start={i * 10}" for i in range(7)
+    ]
+
+
+class FakeThreadExtractor(FakeExtractor):
+    def _get_node_from_url(self, url: str):
+        return Thread(path=("1",), url=url, origin="", data={}, title="")
+
+
+def test_incremental_page_urls(tmp_path: Path):
+    base_url = "https://example.com/"
+    output_path = tmp_path / "out.jsonl"
+    pages = {f"{base_url}?start={i * 10}": make_page(i * 10, 50) for i in range(6)}
+
+    def write(session: FakeSession):
+        writer = JsonlWriter(
+            FakeThreadExtractor(session, base_url, ExtractorOptions(path=False)),
+            WriterOptions(
+                output_path=str(output_path),
+                files_output_path="",
+                write_board_objects=False,
+                write_thread_objects=False,
+                write_post_objects=True,
+                write_file_objects=False,
+                write_outside_file_objects=False,
+                textify=False,
+                content_as_title=False,
+                author_as_addr_spec=False,
+                incremental=True,
+            ),
+        )
+
+        try:
+            writer.write(f"{base_url}?start=0")
+        finally:
+            del writer
+
+        with open(output_path) as f:
+            return [json.loads(line)["item"]["subpath"] for line in f]
+
+    assert write(FakeSession(pages, concurrency=4)) == [[str(i * 10)] for i in range(6)]
+
+    # The next run resumes from the last page read, instead of all pages of the list.
+    pages[f"{base_url}?start=50"] = make_page(50, 60)
+    pages[f"{base_url}?start=60"] = make_page(60, 60)
+    session = FakeSession(pages, concurrency=4)
+
+    assert write(session)[6:] == [["60"]]
+    assert session.fetched_urls == [f"{base_url}?start=50", f"{base_url}?start=60"]
@@ -0,0 +1,57 @@
+# pyright: strict
+from __future__ import annotations
+from typing import *  # type: ignore
+
+from ..extractors.common import ExtractorOptions, Thread
+from ..extractors.hypermail import HypermailExtractor
+from .common import FakeSession
+
+BASE_URL = "https://example.com/archive/"
+
+INDEX_PAGE = """
+<div class="messages-list"><ul>
+<li><a href="0001.html">Root</a>
+<ul>
+<li><a href="0002.html">Reply</a>
+<ul><li><a href="0003.html">Reply</a></li></ul>
+</li>
+<li><a href="0004.html">Reply</a></li>
+</ul>
+</li>
+</ul></div>
+"""
+
+
+def make_message_page(post_id: str):
+    return (
+        f'<meta name="Author" content="{post_id}">'
+        '<meta name="Date" content="2008-01-01T00:00:00Z">'
+        f"<address></address>\n<p>{post_id}</p>"
+    )
+
+
+def test_thread_messages():
+    pages = {f"{BASE_URL}08/": INDEX_PAGE}
+    pages |= {
+        f"{BASE_URL}08/{post_id}.html": make_message_page(post_id)
+        for post_id in ("0001", "0002", "0003", "0004")
+    }
+
+    # The root message comes in last.
+    session = FakeSession(pages, delays={f"{BASE_URL}08/0001.html": 0.2}, concurrency=4)
+    extractor = HypermailExtractor(session, BASE_URL, ExtractorOptions(path=False))
+    thread = Thread(
+        path=("0001",), url=f"{BASE_URL}08/0001.html", origin="", data={}, title=""
+    )
+
+    posts = list(extractor.posts(thread))
+    assert session.completed_urls[-1] == thread.url
+
+    # Each post is paired with its own message.
+    assert [(post.subpath, post.url, post.author) for post in posts] == [
+        ((), f"{BASE_URL}08/0001.html", "0001"),
+        (("0002",), f"{BASE_URL}08/0002.html", "0002"),
+        (("0002", "0003"), f"{BASE_URL}08/0003.html", "0003"),
+        (("0004",), f"{BASE_URL}08/0004.html", "0004"),
+    ]
+    assert all(post.origin == post.url for post in posts)
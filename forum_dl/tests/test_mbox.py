@@ -0,0 +1,98 @@
+# pyright: strict
+from __future__ import annotations
+from typing import *  # type: ignore
+
+from ..extractors.common import ExtractorOptions, Board
+from ..extractors.hyperkitty import HyperkittyExtractor
+from ..mbox import read_messages, thread_messages, get_message_author
+from .common import FakeSession
+
+import gzip
+
+
+def make_message(message_id: str, headers: str = ""):
+    return (
+        f"From jdoe at example.com  Tue Jan  1 12:00:00 2008\n"
+        f"From: jdoe at example.com (John Doe)\n"
+        f"Message-ID: <{message_id}>\n"
+        f"{headers}\n"
+        f"From the body of {message_id}\n\n"
+    )
+
+
+def test_thread_messages():
+    content = gzip.compress(
+        (
+            make_message("a")
+            + make_message("b")
+            + make_message("c", "References: <a>\n")
+            + make_message("d", "In-Reply-To: <c>\nReferences: <a> <c>\n")
+            + make_message("e", "In-Reply-To: <a>\n")
+            # Replies to messages not in the archive start their own threads.
+            + make_message("f", "In-Reply-To: <z>\n")
+        ).encode()
+    )
+
+    messages = list(read_messages(content))
+    assert len(messages) == 6
+    assert get_message_author(messages[0]) == "John Doe"
+
+    threads = [[ids for ids, _ in thread] for thread in thread_messages(messages)]
+    assert threads == [
+        [("a",), ("a", "c"), ("a", "c", "d"), ("a", "e")],
+        [("b",)],
+        [("f",)],
+    ]
+
+
+def test_hyperkitty_export():
+    board_url = "https://example.com/archives/list/test@example.com/"
+    export_url = f"{board_url}export/test@example.com.mbox.gz"
+    pages = {
+        board_url: (
+            '<a href="/archives/list/test@example.com/2007/12/">December 2007</a>'
+            '<a href="/archives/list/test@example.com/2008/1/">January 2008</a>'
+        ),
+        f"{export_url}?start=2008-01-01&end=2008-02-01": gzip.compress(
+            (
+                make_message("a", "Subject: A\n")
+                + make_message("c", "References: <a>\n")
+                + make_message("d", "In-Reply-To: <c>\nReferences: <a> <c>\n")
+            ).encode()
+        ),
+        f"{export_url}?start=2007-12-01&end=2008-01-01": make_message(
+            "b", "Subject: B\n"
+        ).encode(),
+    }
+
+    session = FakeSession(pages, concurrency=2)
+    extractor = HyperkittyExtractor(
+        session,
+        "https://example.com/archives/",
+        ExtractorOptions(path=False, bulk=True),
+    )
+    board = Board(
+        path=("test@example.com",), url=board_url, origin="", data={}, title=""
+    )
+    get_hash = HyperkittyExtractor._get_message_id_hash  # type: ignore
+    hashes = {id: get_hash(id) for id in "abcd"}
+
+    threads: list[tuple[tuple[str, ...], str | None]] = []
+    posts: list[tuple[tuple[str, ...], str]] = []
+
+    # Posts of the threads of a month are only kept while its threads are being written.
+    for thread in extractor.threads(board):
+        threads.append((thread.path, thread.title))
+        posts.extend((post.subpath, post.url) for post in extractor.posts(thread))
+
+    # Newest month first.
+    assert threads == [
+        (("test@example.com", hashes["a"]), "A"),
+        (("test@example.com", hashes["b"]), "B"),
+    ]
+    assert posts == [
+        ((), f"{board_url}message/{hashes['a']}/"),
+        ((hashes["c"],), f"{board_url}message/{hashes['c']}/"),
+        ((hashes["c"], hashes["d"]), f"{board_url}message/{hashes['d']}/"),
+        ((), f"{board_url}message/{hashes['b']}/"),
+    ]
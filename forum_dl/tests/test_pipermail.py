@@ -0,0 +1,62 @@
+# pyright: strict
+from __future__ import annotations
+from typing import *  # type: ignore
+
+from ..extractors.common import ExtractorOptions, Thread
+from ..extractors.pipermail import PipermailExtractor
+from .common import FakeSession
+
+BASE_URL = "https://example.com/"
+MONTH_URL = f"{BASE_URL}pipermail/list/2008-January/"
+
+THREAD_INDEX_PAGE = """
+<ul>
+<!--0 01199145600.31- -->
+<li><a href="000031.html">Root</a>
+<ul>
+<!--1 01199145600.31-01199145601.32- -->
+<li><a href="000032.html">Reply</a>
+<ul>
+<!--2 01199145600.31-01199145601.32-01199145602.33- -->
+<li><a href="000033.html">Reply</a>
+</ul>
+<!--1 01199145600.31-01199145603.34- -->
+<li><a href="000034.html">Reply</a>
+</ul>
+</ul>
+"""
+
+
+def make_message_page(post_id: str):
+    return f"<b>{post_id}</b><i>Tue Jan 1 12:00:00 UTC 2008</i><pre>{post_id}</pre>"
+
+
+def test_thread_messages():
+    pages = {f"{MONTH_URL}thread.html": THREAD_INDEX_PAGE}
+    pages |= {
+        f"{MONTH_URL}{post_id}.html": make_message_page(post_id)
+        for post_id in ("000031", "000032", "000033", "000034")
+    }
+
+    # The root message comes in last.
+    session = FakeSession(pages, delays={f"{MONTH_URL}000031.html": 0.2}, concurrency=4)
+    extractor = PipermailExtractor(session, BASE_URL, ExtractorOptions(path=False))
+    thread = Thread(
+        path=("list", "000031"),
+        url=f"{MONTH_URL}000031.html",
+        origin="",
+        data={},
+        title="",
+    )
+
+    posts = list(extractor.posts(thread))
+    assert session.completed_urls[-1] == thread.url
+
+    # Each post is paired with its own message.
+    assert [(post.subpath, post.url, post.author) for post in posts] == [
+        (("000031",), f"{MONTH_URL}000031.html", "000031"),
+        (("000032",), f"{MONTH_URL}000032.html", "000032"),
+        (("000032", "000033"), f"{MONTH_URL}000033.html", "000033"),
+        (("000034",), f"{MONTH_URL}000034.html", "000034"),
+    ]
+    assert all(post.content == post.author for post in posts)
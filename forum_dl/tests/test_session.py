@@ -0,0 +1,249 @@
+# pyright: strict
+from __future__ import annotations
+from typing import *  # type: ignore
+
+from ..cache import ResponseCache, DiskCache, DetectionEntry, DetectionStore
+from ..extractors import find
+from ..extractors.common import ExtractorOptions
+from ..extractors.hackernews import HackernewsNewExtractor
+from ..extractors.hypermail import HypermailExtractor
+from ..session import HostScheduler, Session, SessionPool
+from ..exceptions import AlreadyVisitedError
+from ..visited import FingerprintSet, BloomFilter, Bitmap, fingerprint
+from .common import FakeSession, make_session_options
+
+from pathlib import Path
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+import pytest
+import time
+
+
+def test_host_scheduler():
+    scheduler = HostScheduler(0.2)
+
+    start = time.monotonic()
+    scheduler.wait("https://a.example.com/1")
+    scheduler.wait("https://b.example.com/1")
+    assert time.monotonic() - start < 0.1
+
+    scheduler.wait("https://a.example.com/2")
+    assert time.monotonic() - start >= 0.2
+
+
+def test_session_pool(tmp_path: Path):
+    pool = SessionPool(make_session_options(http_cache=str(tmp_path)))
+
+    session = pool.get("https://a.example.com/1")
+    other_session = pool.get("https://a.example.com/2")
+
+    # Sessions of a host share connections and cached responses, but not visited requests.
+    assert other_session.cache is session.cache
+    assert other_session._session is session._session  # type: ignore
+    assert other_session._past_requests is not session._past_requests  # type: ignore
+    assert pool.get("https://b.example.com/1").cache is not session.cache
+
+    pool.close()
+
+
+def test_get_many_order():
+    urls = [f"https://example.com/{i}" for i in range(8)]
+    # The first response comes in last.
+    session = FakeSession(
+        {url: url for url in urls}, delays={urls[0]: 0.2}, concurrency=4
+    )
+
+    assert [response.text for response in session.get_many(urls)] == urls
+    assert session.completed_urls[0] != urls[0]
+
+    # Requests made from the worker threads are marked as visited.
+    with pytest.raises(AlreadyVisitedError):
+        session.get(urls[0])
+
+
+def test_get_many_window():
+    urls = [f"https://example.com/{i}" for i in range(20)]
+    session = FakeSession(
+        {url: url for url in urls}, delays={url: 0.02 for url in urls}, concurrency=3
+    )
+    pulled_urls: list[str] = []
+
+    def iter_urls():
+        for url in urls:
+            pulled_urls.append(url)
+            yield url
+
+    responses = session.get_many(iter_urls())
+    assert next(responses).text == urls[0]
+    assert len(pulled_urls) <= 3
+
+    assert [response.text for response in responses] == urls[1:]
+    assert session.max_in_flight == 3
+
+
+def test_get_many_error():
+    urls = [f"https://example.com/{i}" for i in range(20)]
+    # The second page is missing, and the others are slow.
+    session = FakeSession(
+        {url: url for url in urls if url != urls[1]},
+        delays={url: 0.1 for url in urls},
+        concurrency=2,
+    )
+
+    start = time.monotonic()
+
+    with pytest.raises(KeyError):
+        list(session.get_many(urls))
+
+    # Requests not started yet are cancelled instead of waited for.
+    assert time.monotonic() - start < 1
+    assert len(session.fetched_urls) < len(urls)
+
+
+def make_response(content: bytes, headers: dict[str, str] = {}):
+    response = Response()
+    response.status_code = 200
+    response.url = "https://example.com/page"
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = content  # type: ignore
+
+    return response
+
+
+def test_response_cache():
+    entry_size = ResponseCache.estimate_size(make_response(b"aaaa"))
+    assert entry_size == ResponseCache.RESPONSE_OVERHEAD + 4
+    assert ResponseCache.estimate_size(make_response(b"aaaa", {"ETag": "v1"})) == (
+        entry_size + 6
+    )
+    cache: ResponseCache[str] = ResponseCache(2 * entry_size + 2)
+
+    cache.put("a", make_response(b"aaaa"))
+    cache.put("b", make_response(b"bbbb"))
+    assert cache.get("a")
+
+    cache.put("c", make_response(b"cccc"))
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert cache.size == 2 * entry_size
+
+    cache.put("d", make_response(b"d" * cache.max_size))
+    assert cache.get("d") is None
+    assert cache.get("e", should_count_miss=False) is None
+    assert (cache.hits, cache.misses, cache.evictions) == (3, 2, 2)
+
+    assert cache.pop("a")
+    assert len(cache) == 1 and cache.size == entry_size
+
+
+def test_disk_cache(tmp_path: Path):
+    response = make_response(b"content", {"ETag": '"v1"'})
+
+    cache = DiskCache(str(tmp_path))
+    cache.store("https://example.com/page", {"a": 1}, {}, response)
+    cache.close()
+
+    cache = DiskCache(str(tmp_path))
+    assert not cache.load("https://example.com/page", {}, {})
+
+    entry = cache.load("https://example.com/page", {"a": 1}, {})
+    assert entry and entry.validators == {"If-None-Match": '"v1"'}
+
+    revalidated = entry.build_response(response)
+    assert revalidated.status_code == 200 and revalidated.content == b"content"
+
+
+def test_detection_store(tmp_path: Path):
+    path = str(tmp_path / "detection.json")
+    store = DetectionStore(path)
+    store.store(
+        DetectionEntry(
+            "hypermail.HypermailExtractor", "https://example.com/archives/a/"
+        )
+    )
+
+    # Another list under the same prefix is not mistaken for the stored one.
+    store = DetectionStore(path)
+    assert not store.load("https://example.com/archives/b/08/index.html")
+    assert not store.load("https://example.com/archives/")
+    assert store.load("https://example.com/archives/a") == (
+        "hypermail.HypermailExtractor",
+        "https://example.com/archives/a/",
+    )
+
+    store.store(
+        DetectionEntry(
+            "hypermail.HypermailExtractor", "https://example.com/archives/b/"
+        )
+    )
+
+    # Stored sites are not detected again, so no request is made here.
+    session = Session(make_session_options(retries=0))
+
+    for list_id in ("a", "b"):
+        extractor = find(
+            f"https://example.com/archives/{list_id}/08/index.html",
+            session,
+            ExtractorOptions(path=False, detection_cache=path),
+        )
+        assert isinstance(extractor, HypermailExtractor)
+        assert extractor.base_url == f"https://example.com/archives/{list_id}/"
+
+    # Hacker News extractors share their base URL, and are told apart by the URL alone.
+    extractor = find(
+        "https://news.ycombinator.com/newest",
+        session,
+        ExtractorOptions(path=False, detection_cache=path),
+    )
+    assert isinstance(extractor, HackernewsNewExtractor)
+    assert not DetectionStore(path).load("https://news.ycombinator.com/news")
+
+
+def test_fingerprint_set():
+    fps = FingerprintSet(capacity=4)
+    urls = [f"https://example.com/{i}" for i in range(1000)]
+
+    for url in urls[::2]:
+        fps.add(fingerprint(url, {}, {}))
+        fps.add(fingerprint(url, {}, {}))
+
+    assert len(fps) == 500
+    assert all(fingerprint(url, {}, {}) in fps for url in urls[::2])
+    assert not any(fingerprint(url, {}, {}) in fps for url in urls[1::2])
+    assert fingerprint(urls[0], {"page": 2}, {}) not in fps
+
+    restored = FingerprintSet()
+    restored.merge(fps.serialize())
+    assert len(restored) == 500
+    assert all(fingerprint(url, {}, {}) in restored for url in urls[::2])
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(1000, 0.01)
+    urls = [f"https://example.com/{i}" for i in range(2000)]
+
+    for url in urls[:1000]:
+        bloom.add(fingerprint(url, {}, {}))
+
+    assert all(fingerprint(url, {}, {}) in bloom for url in urls[:1000])
+    assert sum(fingerprint(url, {}, {}) in bloom for url in urls[1000:]) < 50
+
+    restored = BloomFilter(1000, 0.01)
+    restored.merge(bloom.serialize())
+    assert all(fingerprint(url, {}, {}) in restored for url in urls[:1000])
+
+    with pytest.raises(ValueError):
+        BloomFilter(2000, 0.01).merge(bloom.serialize())
+
+
+def test_bitmap():
+    bitmap = Bitmap(100)
+    bitmap.add(0)
+    bitmap.add(99)
+
+    assert 0 in bitmap and 99 in bitmap
+    assert 1 not in bitmap and 100 not in bitmap and -1 not in bitmap
+
+    with pytest.raises(IndexError):
+        bitmap.add(100)
@@ -0,0 +1,69 @@
+# pyright: strict
+from __future__ import annotations
+from typing import *  # type: ignore
+
+from ..soup import Soup, SoupStrainer, LxmlSoup
+
+import pytest
+import re
+
+markup = """
+<html><body>
+  <div class="forabg first">
+    <ul><li class="header"><a class="forumtitle" href="viewforum.php?f=1">Board &amp; more</a></li></ul>
+    <a class="forumtitle" href="viewforum.php?f=2">Subboard</a>
+  </div>
+  <div class="post" id="p1">
+    <p class="author">by <span class="username">Alice</span> » Mon Jan 2</p>
+    <div class="content">Hello <b>world</b><br/>&lt;tail&gt;<img src="a.png"/></div>
+  </div>
+  <div class="post" id="p2"><h3><a href="#p2">Re</a></h3><div class="content">Bye</div></div>
+  <a class="next" href="?start=10">Next</a>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize("soup_class", [Soup, LxmlSoup])
+def test_soup(soup_class: type[Soup]):
+    soup = soup_class(markup.encode("utf-8"))
+
+    forabg = soup.find("div", class_="forabg")
+    assert forabg.get_list("class") == ["forabg", "first"]
+    assert forabg.find("li", class_="header").find("a").string == "Board & more"
+    assert [a.get("href") for a in forabg.find_all("a", class_="forumtitle")] == [
+        "viewforum.php?f=1",
+        "viewforum.php?f=2",
+    ]
+
+    posts = soup.select("div.post")
+    assert [post.get("id") for post in posts] == ["p1", "p2"]
+    assert soup.find_all("div", id=re.compile(r"^p\d$"), limit=1)[0].get("id") == "p1"
+
+    author_p = posts[0].find("p", class_="author")
+    assert author_p.find({"a", "span"}, class_={"username"}).string == "Alice"
+    assert author_p.text == "by Alice » Mon Jan 2"
+    assert author_p.find_next("div").name == "div"
+
+    content = posts[0].find("div", class_="content")
+    assert content.string.startswith("Hello <b>world</b><br")
+    assert content.string.endswith("<tail>" + str(content.find("img")))
+    assert [embed.get("src") for embed in content.select("img")] == ["a.png"]
+
+    assert not posts[1].try_find("p")
+    assert posts[1].tags[0].name == "h3"
+    assert [parent.name for parent in posts[1].parents][:2] == ["body", "html"]
+
+    next_anchor = soup.select_one('a.next:-soup-contains("Next")')
+    assert next_anchor and next_anchor.get("href") == "?start=10"
+    assert not soup.select_one("a.previous")
+
+
+def test_soup_strainer():
+    soup = Soup(markup, SoupStrainer("div", class_="post"))
+
+    assert [post.get("id") for post in soup.find_all("div", recursive=False)] == [
+        "p1",
+        "p2",
+    ]
+    assert not soup.try_find("a", class_="forumtitle")
+    assert soup.find("span", class_="username").string == "Alice"
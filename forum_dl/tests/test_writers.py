@@ -0,0 +1,226 @@
+# pyright: strict
+from __future__ import annotations
+from typing import *  # type: ignore
+
+from ..extractors.common import Extractor, ExtractorOptions, Board, Thread, Post
+from ..extractors.common import PageState, DetectionCache
+from ..exceptions import ResumeNotSupportedError
+from ..writers.common import WriterOptions
+from ..writers.jsonl import JsonlWriter, merge
+from ..writers.mbox import MboxWriter
+from ..visited import FingerprintSet
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import json
+import pytest
+
+
+class FakeSession:
+    def __init__(self):
+        self.visited = FingerprintSet()
+        self.dump_count = 0
+
+    @property
+    def visited_count(self):
+        return len(self.visited)
+
+    def dump_visited(self):
+        self.dump_count += 1
+        return self.visited.serialize()
+
+    def merge_visited(self, data: bytes):
+        self.visited.merge(data)
+
+
+class FakeExtractor(Extractor):
+    # Board pages list thread ids, most recently active first. Threads map to their post counts.
+    def __init__(
+        self,
+        pages: list[list[str]],
+        threads: dict[str, int],
+        interrupt_at: int | None = None,
+    ):
+        super().__init__(
+            cast(Any, FakeSession()),
+            "https://example.com/",
+            ExtractorOptions(path=False),
+        )
+        self.pages = pages
+        self.threads = threads
+        self.fetched_pages: list[int] = []
+        self.interrupt_at = interrupt_at
+        self.post_count = 0
+
+    @staticmethod
+    def _detect(
+        session: Any, url: str, options: ExtractorOptions, cache: DetectionCache
+    ):
+        return None
+
+    def _fetch_top_boards(self):
+        pass
+
+    def _do_fetch_subboards(self, board: Board):
+        pass
+
+    def _get_node_from_url(self, url: str):
+        return self.root
+
+    def _fetch_lazy_subboards(self, board: Board):
+        yield from ()
+
+    def _fetch_board_page_threads(self, board: Board, state: PageState):
+        self.fetched_pages.append(state.page)
+
+        for thread_id in self.pages[state.page - 1]:
+            yield Thread(path=(thread_id,), url=thread_id, origin="", data={}, title="")
+
+        if state.page < len(self.pages):
+            return PageState(url=board.url, page=state.page + 1)
+
+    def _fetch_thread_page_posts(self, thread: Thread, state: PageState):
+        for i in range(self.threads[thread.path[0]]):
+            self.post_count += 1
+
+            if self.post_count == self.interrupt_at:
+                raise KeyboardInterrupt
+
+            yield Post(
+                path=thread.path,
+                subpath=(str(i),),
+                url=thread.url,
+                origin="",
+                data={},
+                author="",
+                creation_time=datetime(2020, 1, 1) + timedelta(hours=i),
+                content="",
+            )
+
+
+def make_options(path: Path, **kwargs: Any):
+    return WriterOptions(
+        output_path=str(path),
+        files_output_path="",
+        write_board_objects=True,
+        write_thread_objects=True,
+        write_post_objects=True,
+        write_file_objects=False,
+        write_outside_file_objects=False,
+        textify=False,
+        content_as_title=False,
+        author_as_addr_spec=False,
+        **kwargs,
+    )
+
+
+def write(path: Path, extractor: FakeExtractor, **kwargs: Any):
+    writer = JsonlWriter(extractor, make_options(path, **kwargs))
+
+    try:
+        writer.write("https://example.com/")
+    finally:
+        del writer
+
+    with open(path) as f:
+        return [json.loads(line)["item"] for line in f]
+
+
+def test_incremental(tmp_path: Path):
+    output_path = tmp_path / "out.jsonl"
+
+    extractor = FakeExtractor(
+        [["a", "b"], ["c", "d"]], {"a": 2, "b": 1, "c": 1, "d": 1}
+    )
+    assert len(write(output_path, extractor, incremental=True)) == 1 + 4 + 5
+    assert (tmp_path / "out.jsonl.metadata.json").exists()
+
+    # Only "a" got a new post, so crawling stops once the second board page turns out to bring
+    # nothing new.
+    extractor = FakeExtractor(
+        [["a", "b"], ["c", "d"], ["e"]], {"a": 3, "b": 1, "c": 1, "d": 1, "e": 1}
+    )
+    items = write(output_path, extractor, incremental=True)[10:]
+    assert [(item["path"], item.get("subpath")) for item in items] == [(["a"], ["2"])]
+    assert extractor.fetched_pages == [1, 2, 3]
+
+
+def test_resume(tmp_path: Path):
+    output_path = tmp_path / "out.jsonl"
+    pages = [["a", "b"], ["c", "d"]]
+    threads = {"a": 3, "b": 2, "c": 2, "d": 1}
+
+    extractor = FakeExtractor(pages, threads, interrupt_at=6)
+    extractor.session.visited.add(42)
+
+    with pytest.raises(KeyboardInterrupt):
+        write(output_path, extractor, checkpoint_interval=1e-9)
+
+    assert (tmp_path / "out.jsonl.checkpoint.json").exists()
+
+    # The visited requests are kept aside, and were only written once, as nothing new was visited
+    # after the first checkpoint.
+    assert "visited" not in (tmp_path / "out.jsonl.checkpoint.json").read_text()
+    assert (tmp_path / "out.jsonl.checkpoint.visited").exists()
+    assert extractor.session.dump_count == 1
+
+    extractor = FakeExtractor(pages, threads)
+    items = write(output_path, extractor, resume=True, checkpoint_interval=1e-9)
+
+    assert [(item["path"], item.get("subpath")) for item in items][-5:] == [
+        (["c"], None),
+        (["c"], ["0"]),
+        (["c"], ["1"]),
+        (["d"], None),
+        (["d"], ["0"]),
+    ]
+    assert len(items) == 1 + 4 + 8
+    assert 42 in extractor.session.visited
+    assert not (tmp_path / "out.jsonl.checkpoint.json").exists()
+    assert not (tmp_path / "out.jsonl.checkpoint.visited").exists()
+
+
+def test_resume_mailbox(tmp_path: Path):
+    # Messages written after the checkpoint could not be discarded.
+    with pytest.raises(ResumeNotSupportedError):
+        MboxWriter(
+            FakeExtractor([["a"]], {"a": 1}),
+            make_options(tmp_path / "out.mbox", resume=True),
+        )
+
+
+def test_write_queue(tmp_path: Path):
+    output_path = tmp_path / "out.jsonl"
+    extractor = FakeExtractor([["a", "b"], ["c"]], {"a": 30, "b": 20, "c": 10})
+
+    items = write(output_path, extractor, write_queue_size=2)
+    assert len(items) == 1 + 3 + 60
+    assert [item.get("subpath") for item in items[-3:]] == [["7"], ["8"], ["9"]]
+
+
+def test_merge(tmp_path: Path):
+    shard_paths = [tmp_path / "1.jsonl", tmp_path / "2.jsonl"]
+    write(
+        shard_paths[0], FakeExtractor([["90", "12"], ["9"]], {"90": 1, "12": 2, "9": 1})
+    )
+    write(shard_paths[1], FakeExtractor([["100", "11"]], {"100": 1, "11": 0}))
+
+    output_path = tmp_path / "out.jsonl"
+    merge([str(path) for path in shard_paths], str(output_path))
+
+    with open(output_path) as f:
+        entries = [json.loads(line) for line in f]
+
+    assert [(entry["type"], entry["item"]["path"]) for entry in entries] == [
+        ("board", []),
+        ("thread", ["100"]),
+        ("post", ["100"]),
+        ("thread", ["90"]),
+        ("post", ["90"]),
+        ("thread", ["12"]),
+        ("post", ["12"]),
+        ("post", ["12"]),
+        ("thread", ["11"]),
+        ("thread", ["9"]),
+        ("post", ["9"]),
+    ]
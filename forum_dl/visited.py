@@ -0,0 +1,167 @@
+# pyright: strict
+from __future__ import annotations
+from typing import *  # type: ignore
+
+from array import array
+from hashlib import blake2b
+import math
+import struct
+import threading
+
+
+def fingerprint(url: str, params: dict[str, Any], headers: dict[str, Any]):
+    key = repr((url, sorted(params.items()), sorted(headers.items())))
+    digest = blake2b(key.encode("utf-8"), digest_size=8).digest()
+
+    # 0 marks an empty slot in `FingerprintSet`.
+    return int.from_bytes(digest, "little") or 1
+
+
+class FingerprintSet:
+    # An open-addressing hash table of 64-bit fingerprints. With 8-byte slots and a load factor
+    # kept between 0.25 and 0.5, it takes 16-32 bytes per entry.
+
+    def __init__(self, capacity: int = 1024):
+        size = 1 << max(4, (2 * capacity - 1).bit_length())
+
+        self._lock = threading.Lock()
+        self._table = array("Q", bytes(8 * size))
+        self._mask = size - 1
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, fp: int):
+        with self._lock:
+            table = self._table
+            mask = self._mask
+
+        i = fp & mask
+
+        while slot := table[i]:
+            if slot == fp:
+                return True
+
+            i = (i + 1) & mask
+
+        return False
+
+    def add(self, fp: int):
+        with self._lock:
+            if self._insert(fp):
+                self._len += 1
+
+                if 2 * self._len > len(self._table):
+                    self._grow()
+
+    def serialize(self):
+        with self._lock:
+            return b"F" + array("Q", (fp for fp in self._table if fp)).tobytes()
+
+    def merge(self, data: bytes):
+        if data[:1] != b"F" or (len(data) - 1) % 8:
+            raise ValueError("Not a serialized FingerprintSet")
+
+        fps = array("Q")
+        fps.frombytes(data[1:])
+
+        for fp in fps:
+            self.add(fp)
+
+    def _insert(self, fp: int):
+        table = self._table
+        mask = self._mask
+        i = fp & mask
+
+        while slot := table[i]:
+            if slot == fp:
+                return False
+
+            i = (i + 1) & mask
+
+        table[i] = fp
+        return True
+
+    def _grow(self):
+        old_table = self._table
+
+        self._table = array("Q", bytes(16 * len(old_table)))
+        self._mask = len(self._table) - 1
+
+        for fp in old_table:
+            if fp:
+                self._insert(fp)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self._size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self._hash_count = max(1, round(self._size / capacity * math.log(2)))
+
+        self._lock = threading.Lock()
+        self._bits = bytearray((self._size + 7) // 8)
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def _indices(self, fp: int):
+        # Double hashing: both halves of the fingerprint seed the k bit positions.
+        h1 = fp & 0xFFFFFFFF
+        h2 = (fp >> 32) | 1
+
+        return ((h1 + i * h2) % self._size for i in range(self._hash_count))
+
+    def __contains__(self, fp: int):
+        return all(self._bits[i >> 3] & (1 << (i & 7)) for i in self._indices(fp))
+
+    def serialize(self):
+        with self._lock:
+            header = struct.pack("<QQQ", self._size, self._hash_count, self._len)
+            return b"B" + header + bytes(self._bits)
+
+    def merge(self, data: bytes):
+        header = b"B" + struct.pack("<QQ", self._size, self._hash_count)
+
+        if data[: len(header)] != header or len(data) != len(header) + 8 + len(
+            self._bits
+        ):
+            raise ValueError("Not a serialized BloomFilter of the same size")
+
+        (count,) = struct.unpack("<Q", data[len(header) : len(header) + 8])
+        bits = int.from_bytes(data[len(header) + 8 :], "little")
+
+        with self._lock:
+            bits |= int.from_bytes(self._bits, "little")
+            self._bits = bytearray(bits.to_bytes(len(self._bits), "little"))
+            self._len += count
+
+    def add(self, fp: int):
+        with self._lock:
+            for i in self._indices(fp):
+                self._bits[i >> 3] |= 1 << (i & 7)
+
+            self._len += 1
+
+
+class Bitmap:
+    # A set of integers in `range(size)`, at one bit per possible member.
+
+    def __init__(self, size: int):
+        self.size = size
+        self._bits = bytearray((size + 7) // 8)
+
+    def __contains__(self, i: int):
+        return 0 <= i < self.size and bool(self._bits[i >> 3] & (1 << (i & 7)))
+
+    def add(self, i: int):
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+
+        self._bits[i >> 3] |= 1 << (i & 7)
+
+
+VisitedSet = FingerprintSet | BloomFilter
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import *  # type: ignore
 
 from abc import ABC, abstractmethod
+from collections import Counter
 from pydantic import BaseModel
 from mailbox import Mailbox, Message
 from urllib.parse import urlparse
@@ -10,11 +11,16 @@ from base64 import b64encode, b64decode
 from urllib.parse import quote_plus
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from email.mime.application import MIMEApplication
 from email.encoders import encode_base64
 
 import email.utils
+import logging
 import os
+import queue
 import re
+import threading
+import time
 
 try:
     from html2text import html2text
@@ -25,6 +31,8 @@ from datetime import datetime, timezone
 import sys
 
 from ..extractors.common import Extractor, Item, Thread, Board, Post, File, PageState
+from ..extractors.common import PageListState
+from ..exceptions import ResumeNotSupportedError
 from ..version import __version__
 
 
@@ -39,12 +47,43 @@ class WriterOptions(BaseModel):
     textify: bool
     content_as_title: bool
     author_as_addr_spec: bool
+    incremental: bool = False
+    resume: bool = False
+    checkpoint_interval: float = 60
+    write_queue_size: int = 0
 
 
 class WriterState(BaseModel):
     board_path: tuple[str, ...] | None = None
     board_page: PageState | None = None
+    thread_path: tuple[str, ...] | None = None
     thread_page: PageState | None = None
+    post_subpath: tuple[str, ...] | None = None
+
+
+class Checkpoint(BaseModel):
+    url: str
+    state: WriterState
+    output_size: int | None = None
+
+
+class ThreadMetadata(BaseModel):
+    path: tuple[str, ...]
+    marker: str | None = None
+    page: PageState | None = None
+    page_post_subpaths: set[tuple[str, ...]] = set()
+    last_post_time: datetime | None = None
+
+
+class WriterMetadata(BaseModel):
+    version: str = __version__
+    boards: list[tuple[str, ...]] = []
+    threads: list[ThreadMetadata] = []
+
+
+def as_aware(time: datetime):
+    # Extractors return naive datetimes in UTC.
+    return time if time.tzinfo else time.replace(tzinfo=timezone.utc)
 
 
 class Entry(BaseModel):
@@ -68,19 +107,246 @@ class Writer(ABC):
         self._extractor = extractor
         self._options = options
         self._initial_state = WriterState()
+        self.counts: Counter[str] = Counter()
+
+        self._board_paths: set[tuple[str, ...]] = set()
+        self._threads_metadata: dict[tuple[str, ...], ThreadMetadata] = {}
+
+        self._url = ""
+        self._board_path: tuple[str, ...] | None = None
+        self._last_checkpoint_time = time.monotonic()
+        self._checkpoint: Checkpoint | None = None
+        self._has_written_checkpoint = False
+        self._checkpoint_visited_count: int | None = None
+
+        self._write_queue: (
+            queue.Queue[tuple[Callable[..., None], tuple[Any, ...]] | None] | None
+        ) = None
+        self._write_thread: threading.Thread | None = None
+        self._write_error: BaseException | None = None
+
+        if options.resume:
+            # Resuming needs an output that can be rolled back to the checkpoint, as anything
+            # written after it would otherwise be written twice.
+            if not (checkpoint_path := self._checkpoint_path):
+                raise ResumeNotSupportedError(
+                    f"Can't resume into {type(self).__name__} output"
+                    f" {options.output_path!r}, only into JSONL output files"
+                )
+
+            if os.path.exists(checkpoint_path):
+                self._checkpoint = Checkpoint.parse_file(checkpoint_path)
+                self._initial_state = self._checkpoint.state
 
     def write(self, url: str):
-        self.read_metadata()
+        self._url = url
+
+        if self._checkpoint and self._checkpoint.url != url:
+            self._checkpoint = None
+            self._initial_state = WriterState()
+
+        # Visited requests left by another crawl must not pass for those of this one's checkpoints.
+        visited_path = self._checkpoint_visited_path
+
+        if not self._checkpoint and visited_path and os.path.exists(visited_path):
+            os.remove(visited_path)
+
+        if self._options.incremental and (serialized := self.read_metadata()):
+            metadata = WriterMetadata.parse_raw(serialized)
+
+            self._board_paths = set(metadata.boards)
+            self._threads_metadata = {
+                thread_metadata.path: thread_metadata
+                for thread_metadata in metadata.threads
+            }
+
+        self._start_write_thread()
+
+        try:
+            base_node = self._extractor.node_from_url(url)
 
-        base_node = self._extractor.node_from_url(url)
+            if isinstance(base_node, Board):
+                self.write_board(base_node)
+            elif isinstance(base_node, Thread):
+                self.write_thread(base_node)
 
-        if isinstance(base_node, Board):
-            self.write_board(base_node)
-        elif isinstance(base_node, Thread):
-            self.write_thread(base_node)
+            self._stop_write_thread()
+        except BaseException:
+            self._stop_write_thread(should_raise=False)
+
+            # Once a checkpoint exists, resuming discards the output written after it, so the
+            # metadata must stay at the checkpoint too.
+            if self._options.incremental and not self._has_written_checkpoint:
+                self.write_metadata(self._serialize_metadata())
+
+            raise
+
+        if self._options.incremental:
+            self.write_metadata(self._serialize_metadata())
+
+        for path in (self._checkpoint_path, self._checkpoint_visited_path):
+            if path and os.path.exists(path):
+                os.remove(path)
+
+    def _start_write_thread(self):
+        if self._options.write_queue_size <= 0:
+            return
+
+        # Bounded, so that fetching blocks instead of piling up items when the output is slower.
+        self._write_queue = queue.Queue(self._options.write_queue_size)
+        self._write_error = None
+        self._write_thread = threading.Thread(
+            target=self._run_write_thread, args=(self._write_queue,), daemon=True
+        )
+        self._write_thread.start()
+
+    def _run_write_thread(
+        self,
+        write_queue: queue.Queue[tuple[Callable[..., None], tuple[Any, ...]] | None],
+    ):
+        while True:
+            task = write_queue.get()
+
+            try:
+                if task is None:
+                    return
+
+                # After an error, the queue is still drained so that the producer never blocks.
+                if not self._write_error:
+                    fn, args = task
+                    fn(*args)
+            except BaseException as e:
+                self._write_error = e
+            finally:
+                write_queue.task_done()
+
+    def _stop_write_thread(self, should_raise: bool = True):
+        if self._write_queue and self._write_thread:
+            self._write_queue.put(None)
+            self._write_thread.join()
+
+            self._write_queue = None
+            self._write_thread = None
+
+        if should_raise:
+            self._raise_write_error()
+
+    def _wait_for_writes(self):
+        if self._write_queue:
+            self._write_queue.join()
+
+        self._raise_write_error()
+
+    def _raise_write_error(self):
+        if error := self._write_error:
+            self._write_error = None
+            raise error
+
+    def _submit_write(self, fn: Callable[..., None], *args: Any):
+        if not self._write_queue:
+            fn(*args)
+            return
+
+        self._raise_write_error()
+        self._write_queue.put((fn, args))
+
+    def _serialize_metadata(self):
+        return WriterMetadata(
+            boards=sorted(self._board_paths),
+            threads=list(self._threads_metadata.values()),
+        ).json()
+
+    @property
+    def _checkpoint_path(self):
+        if self._options.output_path != "-":
+            return f"{self._options.output_path}.checkpoint.json"
+
+    @property
+    def _checkpoint_visited_path(self):
+        if self._checkpoint_path:
+            return f"{self._checkpoint_path.removesuffix('.json')}.visited"
+
+    def _maybe_write_checkpoint(self, thread: Thread, post: Post):
+        if not self._checkpoint_path or self._options.checkpoint_interval <= 0:
+            return
+
+        if (
+            time.monotonic() - self._last_checkpoint_time
+            < self._options.checkpoint_interval
+        ):
+            return
+
+        # Written right after a post, while the extractor is still on the pages that hold it, so
+        # resuming from these page states reproduces that post.
+        checkpoint = Checkpoint(
+            url=self._url,
+            state=WriterState(
+                board_path=self._board_path,
+                board_page=self._extractor.board_state,
+                thread_path=thread.path,
+                thread_page=self._extractor.thread_state,
+                post_subpath=post.subpath,
+            ),
+        )
+
+        # The visited requests can grow large, so they are only written when they have changed.
+        visited = None
+        visited_count = self._extractor.session.visited_count
+
+        if visited_count != self._checkpoint_visited_count:
+            visited = self._extractor.session.dump_visited()
+
+        # The checkpoint must never claim more than the output actually holds.
+        self._wait_for_writes()
+        self.flush()
+        checkpoint.output_size = self._output_size()
+
+        if self._options.incremental:
+            self.write_metadata(self._serialize_metadata())
+
+        with open(f"{self._checkpoint_path}.tmp", "w") as f:
+            f.write(checkpoint.json())
+
+        os.replace(f"{self._checkpoint_path}.tmp", self._checkpoint_path)
+
+        # Written after the checkpoint, so that an interruption in between leaves older visited
+        # requests, which only get refetched, rather than newer ones, which would be skipped.
+        if visited is not None and (visited_path := self._checkpoint_visited_path):
+            with open(f"{visited_path}.tmp", "wb") as f:
+                f.write(visited)
+
+            os.replace(f"{visited_path}.tmp", visited_path)
+            self._checkpoint_visited_count = visited_count
+
+        self._last_checkpoint_time = time.monotonic()
+        self._has_written_checkpoint = True
+
+    def _finish_resume(self):
+        visited_path = self._checkpoint_visited_path
+
+        if self._checkpoint and visited_path and os.path.exists(visited_path):
+            # Merged only now, as catching up with the checkpoint refetches pages visited before.
+            try:
+                with open(visited_path, "rb") as f:
+                    self._extractor.session.merge_visited(f.read())
+            except ValueError as e:
+                logging.warning(f"Not restoring visited URLs from checkpoint: {e}")
+
+        self._checkpoint = None
+        self._initial_state = WriterState()
+
+    def flush(self):
+        pass
+
+    def _output_size(self) -> int | None:
+        return None
 
     @abstractmethod
-    def read_metadata(self):
+    def read_metadata(self) -> str | None:
+        pass
+
+    @abstractmethod
+    def write_metadata(self, serialized: str):
         pass
 
     @abstractmethod
@@ -88,21 +354,68 @@ class Writer(ABC):
         pass
 
     def _write_board_threads(self, board: Board):
+        page = None
+        has_page_new_posts = False
+        self._board_path = board.path
+
         for item in self._extractor.threads_with_files(
             board, self._initial_state.board_page
         ):
+            if self._checkpoint:
+                # Threads before the checkpointed one on its page have already been written.
+                if (
+                    isinstance(item, Thread)
+                    and item.path == self._checkpoint.state.thread_path
+                ):
+                    self.write_thread(item)
+
+                    if self._checkpoint:
+                        self._finish_resume()
+
+                continue
+
+            if self._options.incremental and (state := self._extractor.board_state):
+                if state.page != page:
+                    # Boards list their most recently active threads first, so once a whole page
+                    # brings nothing new, the rest of the board has already been archived.
+                    if page is not None and not has_page_new_posts:
+                        break
+
+                    page = state.page
+                    has_page_new_posts = False
+
             match item:
                 case Thread():
-                    self.write_thread(item)
+                    has_page_new_posts |= self.write_thread(item)
                 case File():
                     self.write_file(item)
 
+        # The checkpointed thread has disappeared from the board.
+        if self._checkpoint:
+            self._finish_resume()
+
     @final
     def write_board(self, board: Board):
-        if self._options.write_board_objects:
-            self._write_board_object(board)
-
-        self._write_board_threads(board)
+        resume_path = self._checkpoint.state.board_path if self._checkpoint else None
+
+        if resume_path is None:
+            if (
+                self._options.write_board_objects
+                and board.path not in self._board_paths
+            ):
+                self._submit_write(self._write_board_object, board)
+                self.counts["boards"] += 1
+
+            if self._options.incremental:
+                self._board_paths.add(board.path)
+
+            self._write_board_threads(board)
+        elif board.path == resume_path:
+            self._write_board_threads(board)
+        elif board.path != resume_path[: len(board.path)]:
+            # Boards are written depth-first, so the ones met before the checkpointed board are
+            # done, and its ancestors only have subboards left.
+            return
 
         for _, subboard in self._extractor.subboards(board).items():
             self.write_board(subboard)
@@ -111,22 +424,115 @@ class Writer(ABC):
     def _write_thread_object(self, thread: Thread):
         pass
 
-    def _write_thread_posts(self, thread: Thread):
-        for item in self._extractor.posts_with_files(
-            thread, self._initial_state.thread_page
-        ):
+    def _write_thread_posts(self, thread: Thread, metadata: ThreadMetadata | None):
+        initial_state = self._initial_state.thread_page
+        has_new_posts = False
+        skipped_subpaths: set[tuple[str, ...]] = set()
+
+        if metadata and not self._checkpoint:
+            if metadata.page_post_subpaths and (
+                update_state := self._extractor.get_thread_update_state(
+                    thread, metadata.page_post_subpaths
+                )
+            ):
+                initial_state = update_state
+            elif metadata.page:
+                initial_state = metadata.page.copy(deep=True)
+
+        for item in self._extractor.posts_with_files(thread, initial_state):
+            if self._checkpoint:
+                if (
+                    isinstance(item, Post)
+                    and item.subpath == self._checkpoint.state.post_subpath
+                ):
+                    self._finish_resume()
+
+                continue
+
             match item:
                 case Post():
+                    if metadata and self._is_post_archived(metadata, item):
+                        skipped_subpaths.add(item.subpath)
+                        continue
+
                     self.write_post(thread, item)
+                    has_new_posts = True
+
+                    if metadata:
+                        self._update_thread_metadata(metadata, item)
+
+                    self._maybe_write_checkpoint(thread, item)
                 case File():
-                    self.write_file(item)
+                    if item.subpath[:-1] not in skipped_subpaths:
+                        self.write_file(item)
+
+        # The checkpointed post has disappeared from the thread.
+        if self._checkpoint:
+            self._finish_resume()
+
+        return has_new_posts
+
+    def _is_post_archived(self, metadata: ThreadMetadata, post: Post):
+        if post.subpath in metadata.page_post_subpaths:
+            return True
+
+        return bool(
+            post.creation_time
+            and metadata.last_post_time
+            and as_aware(post.creation_time) < as_aware(metadata.last_post_time)
+        )
+
+    def _update_thread_metadata(self, metadata: ThreadMetadata, post: Post):
+        state = self._extractor.thread_state
+
+        # Extractor-specific page states may carry data that goes stale between runs (e.g. a
+        # snapshot of all post ids), so only plain URL-based ones are resumed from. Otherwise,
+        # all subpaths of the thread are kept. Page lists are resumed from their current page,
+        # from which the following pages are found through next page links.
+        if isinstance(state, PageListState):
+            state = PageState(url=state.url, page=state.page)
+
+        if type(state) is PageState and (
+            not metadata.page or metadata.page.url != state.url
+        ):
+            metadata.page = state.copy(deep=True)
+            metadata.page_post_subpaths = set()
+
+        metadata.page_post_subpaths.add(post.subpath)
+
+        if post.creation_time and (
+            not metadata.last_post_time
+            or as_aware(post.creation_time) > as_aware(metadata.last_post_time)
+        ):
+            metadata.last_post_time = post.creation_time
 
     @final
     def write_thread(self, thread: Thread):
-        if self._options.write_thread_objects:
-            self._write_thread_object(thread)
+        metadata = None
+        marker = None
+
+        if self._options.incremental:
+            marker = self._extractor.get_thread_marker(thread)
+            metadata = self._threads_metadata.get(thread.path)
+
+            if metadata and marker is not None and metadata.marker == marker:
+                return False
+
+        if self._options.write_thread_objects and not (metadata or self._checkpoint):
+            self._submit_write(self._write_thread_object, thread)
+            self.counts["threads"] += 1
+
+        if self._options.incremental and not metadata:
+            metadata = self._threads_metadata[thread.path] = ThreadMetadata(
+                path=thread.path
+            )
+
+        has_new_posts = self._write_thread_posts(thread, metadata)
+
+        if metadata:
+            metadata.marker = marker
 
-        self._write_thread_posts(thread)
+        return has_new_posts
 
     @abstractmethod
     def _write_post_object(self, thread: Thread, post: Post):
@@ -135,7 +541,8 @@ class Writer(ABC):
     @final
     def write_post(self, thread: Thread, post: Post):
         if self._options.write_post_objects:
-            self._write_post_object(thread, post)
+            self._submit_write(self._write_post_object, thread, post)
+            self.counts["posts"] += 1
 
     @final
     def write_file(self, file: File):
@@ -186,7 +593,8 @@ class Writer(ABC):
                     )
                     file.content = b64encode(response.content)
 
-        self._write_file_object(file)
+        self._submit_write(self._write_file_object, file)
+        self.counts["files"] += 1
 
     @abstractmethod
     def _write_file_object(self, file: File):
@@ -197,6 +605,13 @@ class SimulatedWriter(Writer):
     def read_metadata(self):
         pass
 
+    def write_metadata(self, serialized: str):
+        pass
+
+    @property
+    def _checkpoint_path(self):
+        return None
+
     def _write_board_object(self, board: Board):
         pass
 
@@ -215,7 +630,14 @@ class FileWriter(Writer):
         super().__init__(extractor, options)
 
         if options.output_path != "-":
-            self._file = open(options.output_path, "w")
+            self._file = open(
+                options.output_path,
+                "a" if options.incremental or self._checkpoint else "w",
+            )
+
+            # Entries written after the checkpoint will be written again.
+            if self._checkpoint and self._checkpoint.output_size is not None:
+                self._file.truncate(self._checkpoint.output_size)
         else:
             self._file = None
 
@@ -224,7 +646,35 @@ class FileWriter(Writer):
             self._file.close()
 
     def read_metadata(self):
-        pass  # TODO.
+        if self._file and os.path.exists(self._metadata_path):
+            with open(self._metadata_path) as f:
+                return f.read()
+
+    def write_metadata(self, serialized: str):
+        if not self._file:
+            return
+
+        # Metadata must never claim more than the output actually holds.
+        self.flush()
+
+        with open(f"{self._metadata_path}.tmp", "w") as f:
+            f.write(serialized)
+
+        os.replace(f"{self._metadata_path}.tmp", self._metadata_path)
+
+    @property
+    def _metadata_path(self):
+        return f"{self._options.output_path}.metadata.json"
+
+    def flush(self):
+        if self._file:
+            self._file.flush()
+        else:
+            sys.stdout.flush()
+
+    def _output_size(self):
+        if self._file:
+            return self._file.tell()
 
     def _write_board_object(self, board: Board):
         entry = self._make_entry(board)
@@ -292,28 +742,56 @@ class MailWriter(Writer):
         mailbox: Mailbox[Any],
         options: WriterOptions,
     ):
-        super().__init__(extractor, options)
+        # Set first, as the mailbox is closed on deletion even if initialization fails.
         self._mailbox = mailbox
+        super().__init__(extractor, options)
         self._message_key = None
 
         for key, msg in self._mailbox.iteritems():
             if msg.get("X-Forumdl-Version"):
                 self._metadata_key = key
+                break
         else:
-            msg = self._new_message()
-            self._metadata_key = self._mailbox.add(msg)
+            self._metadata_key = self._mailbox.add(self._new_metadata_message())
 
     def __del__(self):
         self._mailbox.flush()
         self._mailbox.close()
 
+    @property
+    def _checkpoint_path(self):
+        # Mailboxes can't be truncated back to a checkpoint.
+        return None
+
     def write(self, url: str):
         self._mailbox.lock()
-        super().write(url)
-        self._mailbox.unlock()
+
+        try:
+            super().write(url)
+        finally:
+            self._mailbox.flush()
+            self._mailbox.unlock()
 
     def read_metadata(self):
-        pass  # TODO.
+        for part in self._mailbox[self._metadata_key].walk():
+            if part.get_content_type() == "application/json":
+                return cast(bytes, part.get_payload(decode=True)).decode("utf-8")
+
+    def write_metadata(self, serialized: str):
+        self._mailbox[self._metadata_key] = self._new_metadata_message(serialized)
+        self._mailbox.flush()
+
+    def flush(self):
+        self._mailbox.flush()
+
+    def _new_metadata_message(self, serialized: str | None = None):
+        msg = self._new_message()
+        msg["X-Forumdl-Version"] = __version__
+
+        if serialized:
+            msg.attach(MIMEApplication(serialized.encode("utf-8"), "json"))
+
+        return msg
 
     def _write_board_object(self, board: Board):
         pass  # TODO.
@@ -360,9 +838,10 @@ class MailWriter(Writer):
 
         msg["Message-ID"] = "<" + ".".join(path) + ">"
         msg["Content-Location"] = post.url
-        msg["Date"] = email.utils.formatdate(
-            datetime.fromisoformat(post.creation_time).timestamp()
-        )
+        if post.creation_time:
+            msg["Date"] = email.utils.formatdate(
+                as_aware(post.creation_time).timestamp()
+            )
 
         if self._options.author_as_addr_spec:
             domain = urlparse(self._extractor.base_url).netloc
@@ -407,11 +886,11 @@ class FolderedMailWriter(MailWriter):
         self.folders: dict[str, Mailbox[Any]] = {}
         self._folder_name = None
 
-    def _get_folder_name(self, board: Board):
-        return ".".join(board.path)
+    def _get_folder_name(self, board_path: tuple[str, ...]):
+        return ".".join(board_path)
 
     def _write_board_object(self, board: Board):
-        folder_name = self._get_folder_name(board)
+        folder_name = self._get_folder_name(board.path)
 
         if folder_name not in self.folders:
             self.folders[folder_name] = getattr(self._mailbox, "add_folder")(
@@ -421,8 +900,8 @@ class FolderedMailWriter(MailWriter):
         super()._write_board_object(board)
 
     def _write_post_object(self, thread: Thread, post: Post):
-        board = self._extractor.find_board(thread.path[:-1])
-        folder_name = self._get_folder_name(board)
+        # Not looking the board up through the extractor, which may be fetching on another thread.
+        folder_name = self._get_folder_name(thread.path[:-1])
 
         if folder_name not in self.folders:
             self.folders[folder_name] = getattr(self._mailbox, "add_folder")(
@@ -2,9 +2,61 @@
 from __future__ import annotations
 from typing import *  # type: ignore
 
+import heapq
+import json
+import sys
+
 from .common import FileWriter, Entry
 
 
 class JsonlWriter(FileWriter):
     def _serialize_entry(self, entry: Entry):
         return entry.json(models_as_dict=False)
+
+
+def _read_thread_blocks(path: str):
+    # Yields each thread entry together with the post and file entries following it. Entries
+    # before the first thread (boards) come as a block of their own.
+    block: list[str] = []
+
+    with open(path) as f:
+        for line in f:
+            if json.loads(line)["type"] in ("thread", "board") and block:
+                yield block
+                block = []
+
+            block.append(line)
+
+    if block:
+        yield block
+
+
+def _get_block_key(block: list[str]):
+    entry = json.loads(block[0])
+    thread_id = entry["item"]["path"][-1] if entry["item"]["path"] else ""
+
+    # Numeric ids sort by value this way, without breaking on non-numeric ones.
+    return (entry["type"] == "board", len(thread_id), thread_id)
+
+
+def merge(input_paths: list[str], output_path: str):
+    # Merges outputs whose threads are each ordered by descending id, such as those of sharded
+    # Hacker News crawls, into one output in the same order. Boards come first.
+    output = sys.stdout if output_path == "-" else open(output_path, "w")
+    prev_key = None
+
+    try:
+        for block in heapq.merge(
+            *(_read_thread_blocks(path) for path in input_paths),
+            key=_get_block_key,
+            reverse=True,
+        ):
+            # Duplicates, e.g. the root board of each shard, end up next to each other.
+            if (key := _get_block_key(block)) == prev_key:
+                continue
+
+            output.writelines(block)
+            prev_key = key
+    finally:
+        if output is not sys.stdout:
+            output.close()